@@ -7,9 +7,16 @@ else()
 endif()
 
 set(GLADIATOR_OUTPUT ${CMAKE_BINARY_DIR}/opengl.hxx)
+set(GLADIATOR_DEPFILE ${CMAKE_BINARY_DIR}/opengl.hxx.d)
+# NOTE: DEPFILE requires Ninja before CMake 3.20
+if(CMAKE_GENERATOR MATCHES "Ninja" OR CMAKE_VERSION VERSION_GREATER_EQUAL 3.20)
+	set(GLADIATOR_DEPFILE_ARGS --depfile ${GLADIATOR_DEPFILE})
+	set(GLADIATOR_DEPFILE_OPTION DEPFILE ${GLADIATOR_DEPFILE})
+endif()
 add_custom_command(
 	OUTPUT ${GLADIATOR_OUTPUT}
-	COMMAND Python3::Interpreter -m gladiator --config-file ${GLADIATOR_CONFIG} --output ${GLADIATOR_OUTPUT}
+	COMMAND Python3::Interpreter -m gladiator --config-file ${GLADIATOR_CONFIG} --output ${GLADIATOR_OUTPUT} ${GLADIATOR_DEPFILE_ARGS}
 	WORKING_DIRECTORY ${CMAKE_SOURCE_DIR}/cmake
-	DEPENDS ${GLADIATOR_CONFIG}
+	DEPENDS ${GLADIATOR_CONFIG} ${CMAKE_SOURCE_DIR}/cmake/gl.xml
+	${GLADIATOR_DEPFILE_OPTION}
 )
@@ -0,0 +1,155 @@
+"""Generate many targets from a single parse of each spec file."""
+
+from argparse import ArgumentParser
+from concurrent.futures import ProcessPoolExecutor
+import multiprocessing
+from pathlib import Path
+import sys
+from typing import Dict, Iterable, List, Mapping, Sequence
+
+from gladiator.cache import get_cache_dir, load_index
+from gladiator.options import make_argument_parser, Options
+from gladiator.parse.index import SpecIndex
+from gladiator.pipeline import check_preconditions, generate
+
+
+# NOTE: filled before the worker pool is started, so forked workers inherit
+# the indexes instead of loading them again
+_INDEXES: Dict[Path, SpecIndex] = {}
+
+
+def _get_index(options: Options) -> SpecIndex:
+    key = Path(options.spec_file).resolve()
+    if key not in _INDEXES:
+        _INDEXES[key] = load_index(
+            options.spec_file, get_cache_dir(options), memory_map=options.memory_map
+        )
+    return _INDEXES[key]
+
+
+def target_to_args(target: Mapping[str, object]) -> List[str]:
+    """Convert a manifest target to the command-line arguments of a separate
+    run, using the same keys as config files.
+    """
+    args: List[str] = []
+    for key, value in target.items():
+        flag = f"--{key}"
+        if value is True:
+            args.append(flag)
+        elif value is False or value is None:
+            continue
+        elif isinstance(value, (list, tuple)):
+            args += [flag, *(str(v) for v in value)]
+        else:
+            args += [flag, str(value)]
+    return args
+
+
+def read_manifest(path: Path) -> Iterable[List[str]]:
+    """Read the targets of a manifest as command-line arguments. A manifest
+    lists `targets` and optionally `defaults` shared by all targets.
+    """
+    with open(path, encoding="utf-8") as file:
+        import yaml  # NOTE: only needed for manifests
+
+        manifest = yaml.safe_load(file) or {}
+
+    defaults = manifest.get("defaults") or {}
+    for target in manifest.get("targets") or ():
+        yield target_to_args({**defaults, **target})
+
+
+def parse_target(args: Sequence[str]) -> Options:
+    """Parse the options of a single target like a separate run would."""
+    try:
+        parsed_cli = make_argument_parser().parse_args(list(args))
+    except SystemExit as exc:
+        raise SystemExit(f"ERROR: Invalid batch target: {' '.join(args)}") from exc
+
+    options = Options(**(parsed_cli.__dict__))
+    check_preconditions(options)
+    return options
+
+
+def _check_outputs(targets: Sequence[Options]):
+    outputs = [options.output or options.output_dir for options in targets]
+    if None in outputs:
+        raise SystemExit("ERROR: Every batch target must specify an output")
+    if len({Path(output).resolve() for output in outputs}) != len(outputs):
+        raise SystemExit("ERROR: Batch targets must not share an output")
+
+
+def _generate_target(options: Options):
+    generate(_get_index(options), options)
+    return options.output
+
+
+def _get_pool_context():
+    # NOTE: workers started any other way still load the indexes from the cache
+    if "fork" in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context("fork")
+    return multiprocessing.get_context()
+
+
+def generate_targets(targets: Sequence[Options], jobs: int = 1) -> Iterable[Path]:
+    """Generate all targets using the given number of worker processes, loading
+    every spec file once. Yields the outputs in the order of the targets.
+    """
+    _check_outputs(targets)
+    for options in targets:
+        _get_index(options)
+
+    if jobs <= 1 or len(targets) <= 1:
+        yield from map(_generate_target, targets)
+        return
+
+    with ProcessPoolExecutor(
+        max_workers=min(jobs, len(targets)), mp_context=_get_pool_context()
+    ) as pool:
+        yield from pool.map(_generate_target, targets)
+
+
+def _make_argparser():
+    parser = ArgumentParser(
+        prog="python -m gladiator batch",
+        description="Generate many targets from a single parse of the spec file",
+    )
+    parser.add_argument(
+        "--config-file",
+        nargs="+",
+        default=[],
+        help="config files of targets, each including its output",
+    )
+    parser.add_argument(
+        "--manifest", type=Path, default=None, help="YAML file listing targets"
+    )
+    parser.add_argument(
+        "--jobs",
+        "-j",
+        type=int,
+        default=1,
+        help="number of worker processes (default: 1)",
+    )
+    return parser
+
+
+def cli(*args) -> int:
+    try:
+        options = _make_argparser().parse_args(args)
+    except SystemExit as exc:
+        return exc.code
+
+    target_args = [["--config-file", path] for path in options.config_file]
+    if options.manifest:
+        target_args += read_manifest(options.manifest)
+    if not target_args:
+        raise SystemExit("ERROR: Must specify config files or a manifest")
+
+    for _ in generate_targets([parse_target(a) for a in target_args], options.jobs):
+        pass
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(cli(*sys.argv[1:]))
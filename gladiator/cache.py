@@ -0,0 +1,282 @@
+"""Persist the spec index across runs, keyed by the contents of the spec file."""
+
+from datetime import datetime, timedelta
+import hashlib
+import os
+from pathlib import Path
+import pickle
+from typing import (
+    BinaryIO,
+    Callable,
+    Dict,
+    Generic,
+    Iterable,
+    Mapping,
+    Optional,
+    TYPE_CHECKING,
+    TypeVar,
+    Union,
+)
+
+from gladiator import __version__
+from gladiator.parse.command import encode_command, parse_indexed_command
+from gladiator.parse.feature import Feature, FeatureApi, FeatureVersion
+from gladiator.parse.index import (
+    IndexedCommand,
+    IndexedEnumValue,
+    IndexedExtension,
+    SpecIndex,
+)
+from gladiator.parse.spec import build_spec_index, load_spec
+from gladiator.parse.type import TypeDefinition
+
+if TYPE_CHECKING:
+    from gladiator.options import Options
+
+
+_CACHE_FORMAT = 2
+_ENTRY_SUFFIX = ".index"
+_BYTECODE_SUFFIX = ".bytecode"
+_TEMP_SUFFIX = ".tmp"
+_HASH_CHUNK_SIZE = 1 << 20
+
+
+def get_default_cache_dir() -> Path:
+    """Determine the cache dir from the environment (GLADIATOR_CACHE_DIR,
+    XDG_CACHE_HOME) or fall back to ~/.cache/gladiator.
+    """
+    explicit = os.environ.get("GLADIATOR_CACHE_DIR")
+    if explicit:
+        return Path(explicit)
+
+    base = os.environ.get("XDG_CACHE_HOME")
+    return (Path(base) if base else Path.home() / ".cache") / "gladiator"
+
+
+def get_cache_dir(options: "Options") -> Optional[Path]:
+    """Determine the cache dir to use for the given options, if any."""
+    if options.no_cache:
+        return None
+    return options.cache_dir or get_default_cache_dir()
+
+
+def _hash_spec(spec_file: Union[str, Path]):
+    digest = hashlib.sha256(f"{__version__}:{_CACHE_FORMAT}:".encode("utf-8"))
+    with open(spec_file, "rb") as file:
+        for chunk in iter(lambda: file.read(_HASH_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _entry_path(cache_dir: Path, key: str):
+    return cache_dir / f"{__version__}-{key}{_ENTRY_SUFFIX}"
+
+
+def _encode_index(index: SpecIndex):
+    return (
+        tuple((t.name, t.statement) for t in index.types),
+        {
+            name: tuple((v.position, v.value, v.type_, v.groups) for v in values)
+            for name, values in index.enums.items()
+        },
+        dict(index.bitmask_groups),
+        {
+            name: (entry.position, encode_command(parse_indexed_command(entry)))
+            for name, entry in index.commands.items()
+        },
+        tuple(
+            (f.api.value, f.version.major, f.version.minor, tuple(changes))
+            for f, changes in index.features.items()
+        ),
+        # NOTE: only needed for --extensions, so not even unpickled otherwise
+        pickle.dumps(
+            {
+                name: (entry.supported, tuple(entry.changes))
+                for name, entry in index.extensions.items()
+            },
+            pickle.HIGHEST_PROTOCOL,
+        ),
+    )
+
+
+K = TypeVar("K")
+V = TypeVar("V")
+
+
+class _LazyMapping(Mapping[K, V], Generic[K, V]):
+    """Decode values of a cached mapping on first access."""
+
+    def __init__(self, encoded: Dict[K, object], decode: Callable[[K, object], V]):
+        self._encoded = encoded
+        self._decoded: Dict[K, V] = {}
+        self._decode = decode
+
+    def __getitem__(self, key: K) -> V:
+        if key not in self._decoded:
+            self._decoded[key] = self._decode(key, self._encoded[key])
+        return self._decoded[key]
+
+    def __iter__(self):
+        return iter(self._encoded)
+
+    def __len__(self):
+        return len(self._encoded)
+
+
+class _PickledMapping(_LazyMapping[K, V]):
+    """Unpickle a cached mapping on first access and decode its values on
+    first access as well.
+    """
+
+    def __init__(self, pickled: bytes, decode: Callable[[K, object], V]):
+        super().__init__({}, decode)
+        self._pickled: Optional[bytes] = pickled
+
+    def _unpickle(self):
+        if self._pickled is not None:
+            self._encoded = pickle.loads(self._pickled)
+            self._pickled = None
+
+    def __getitem__(self, key: K) -> V:
+        self._unpickle()
+        return super().__getitem__(key)
+
+    def __iter__(self):
+        self._unpickle()
+        return super().__iter__()
+
+    def __len__(self):
+        self._unpickle()
+        return super().__len__()
+
+
+def _decode_enum_values(name: str, encoded):
+    return tuple(
+        IndexedEnumValue(position=position, name=name, value=value, type_=t, groups=g)
+        for position, value, t, g in encoded
+    )
+
+
+def _decode_command(_name: str, encoded):
+    position, definition = encoded
+    return IndexedCommand(position=position, definition=definition)
+
+
+def _decode_extension(name: str, encoded):
+    supported, changes = encoded
+    return IndexedExtension(name=name, supported=supported, changes=changes)
+
+
+def _decode_index(encoded) -> SpecIndex:
+    types, enums, bitmask_groups, commands, features, extensions = encoded
+    # NOTE: the mappings are only decoded on access, long after the entry was
+    # read, so a malformed entry has to be rejected here to be rebuilt
+    if not (
+        isinstance(enums, dict)
+        and isinstance(bitmask_groups, dict)
+        and isinstance(commands, dict)
+        and isinstance(extensions, bytes)
+    ):
+        raise TypeError("malformed cache entry")
+    return SpecIndex(
+        types=tuple(TypeDefinition(name=n, statement=s) for n, s in types),
+        enums=_LazyMapping(enums, _decode_enum_values),
+        bitmask_groups=bitmask_groups,
+        commands=_LazyMapping(commands, _decode_command),
+        features={
+            Feature(
+                api=FeatureApi.from_string(api),
+                version=FeatureVersion(major=major, minor=minor),
+            ): changes
+            for api, major, minor, changes in features
+        },
+        extensions=_PickledMapping(extensions, _decode_extension),
+    )
+
+
+def _read_entry(path: Path) -> Optional[SpecIndex]:
+    try:
+        with open(path, "rb") as file:
+            index = _decode_index(pickle.load(file))
+        os.utime(path)  # NOTE: mark as recently used for pruning
+        return index
+    except FileNotFoundError:
+        return None
+    except (OSError, pickle.UnpicklingError, EOFError, ValueError, TypeError):
+        return None  # NOTE: written by an incompatible version or corrupted
+
+
+def write_cache_file(path: Path, dump: Callable[[BinaryIO], None]):
+    """Atomically write a cache file using the given function, ignoring errors."""
+    # NOTE: parallel jobs may write the same entry; only complete files are
+    # ever renamed into place, so readers never see a partial entry
+    import tempfile  # NOTE: imported on demand, most runs only read the cache
+
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with tempfile.NamedTemporaryFile(
+            dir=path.parent, prefix=path.stem, suffix=_TEMP_SUFFIX, delete=False
+        ) as file:
+            dump(file)
+        os.replace(file.name, path)
+    except OSError:
+        pass  # NOTE: a read-only or full cache dir must not fail generation
+
+
+def get_bytecode_path(cache_dir: Path, key: str) -> Path:
+    """Get the path compiled templates with the given key are cached at."""
+    return cache_dir / f"{key}{_BYTECODE_SUFFIX}"
+
+
+def _write_entry(path: Path, index: SpecIndex):
+    write_cache_file(
+        path,
+        lambda file: pickle.dump(_encode_index(index), file, pickle.HIGHEST_PROTOCOL),
+    )
+
+
+def load_index(
+    spec_file: Union[str, Path],
+    cache_dir: Optional[Path] = None,
+    memory_map: bool = False,
+) -> SpecIndex:
+    """Load the index of the given spec file from the cache dir, building and
+    storing it first if it is not cached yet. Skip the cache if no cache dir
+    is given.
+    """
+    if cache_dir is None:
+        return build_spec_index(load_spec(spec_file, memory_map=memory_map))
+
+    path = _entry_path(cache_dir, _hash_spec(spec_file))
+    index = _read_entry(path)
+    if index is None:
+        index = build_spec_index(load_spec(spec_file, memory_map=memory_map))
+        _write_entry(path, index)
+    return index
+
+
+def _is_stale(path: Path, oldest: datetime):
+    if path.suffix == _ENTRY_SUFFIX and not path.name.startswith(f"{__version__}-"):
+        return True
+    return datetime.fromtimestamp(path.stat().st_mtime) < oldest
+
+
+def prune_cache(cache_dir: Path, max_age: Optional[timedelta]) -> Iterable[Path]:
+    """Remove entries of other gladiator versions, leftovers of interrupted
+    writes and entries (including compiled templates) that were not used
+    within the given age. Remove all entries if no age is given. Yields the
+    removed files.
+    """
+    if not cache_dir.is_dir():
+        return
+
+    oldest = datetime.now() - max_age if max_age is not None else datetime.max
+    for path in cache_dir.iterdir():
+        if path.suffix not in (_ENTRY_SUFFIX, _BYTECODE_SUFFIX, _TEMP_SUFFIX):
+            continue
+        try:
+            if _is_stale(path, oldest):
+                path.unlink()
+                yield path
+        except FileNotFoundError:
+            pass  # NOTE: removed by a concurrent prune
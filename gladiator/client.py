@@ -0,0 +1,95 @@
+"""Thin client sending generation requests to a running `python -m gladiator serve`.
+Only depends on the standard library to keep its startup cheap.
+"""
+
+from argparse import ArgumentParser
+import getpass
+import json
+import os
+from pathlib import Path
+import socket
+import sys
+import tempfile
+from typing import Any, Dict, Union
+
+
+def get_default_socket_path() -> Path:
+    """Determine the socket path from the environment (GLADIATOR_SOCKET,
+    XDG_RUNTIME_DIR) or fall back to the temp dir.
+    """
+    explicit = os.environ.get("GLADIATOR_SOCKET")
+    if explicit:
+        return Path(explicit)
+
+    runtime_dir = os.environ.get("XDG_RUNTIME_DIR")
+    if runtime_dir:
+        return Path(runtime_dir) / "gladiator.sock"
+    return Path(tempfile.gettempdir()) / f"gladiator-{getpass.getuser()}.sock"
+
+
+def send_request(
+    socket_path: Union[str, Path], request: Dict[str, Any]
+) -> Dict[str, Any]:
+    """Send a single request to the server and wait for its response. Refuse
+    to send it to a socket of another user, e.g. one planted in the temp dir.
+    """
+    if os.stat(socket_path).st_uid != os.getuid():
+        raise PermissionError(f"{socket_path} is not owned by the current user")
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as connection:
+        connection.connect(str(socket_path))
+        connection.sendall(json.dumps(request).encode("utf-8") + b"\n")
+        with connection.makefile("rb") as response:
+            return json.loads(response.readline())
+
+
+def _make_argparser():
+    parser = ArgumentParser(
+        prog="python -m gladiator.client",
+        description="Generate code using a running server, passing all other "
+        "arguments on as is (generates in-process if no server is running)",
+        allow_abbrev=False,
+    )
+    parser.add_argument(
+        "--socket",
+        type=Path,
+        default=None,
+        help="socket of the server (default: $GLADIATOR_SOCKET or $XDG_RUNTIME_DIR/gladiator.sock)",
+    )
+    parser.add_argument(
+        "--shutdown", action="store_true", default=False, help="stop the server"
+    )
+    return parser
+
+
+def cli(*args) -> int:
+    try:
+        options, generator_args = _make_argparser().parse_known_args(args)
+    except SystemExit as exc:
+        return exc.code
+
+    socket_path = options.socket or get_default_socket_path()
+    request = (
+        {"shutdown": True}
+        if options.shutdown
+        else {"cwd": os.getcwd(), "args": generator_args}
+    )
+    try:
+        response = send_request(socket_path, request)
+    except (FileNotFoundError, ConnectionRefusedError):
+        if options.shutdown:
+            return 0
+
+        # NOTE: imported late since it is expensive and usually not needed
+        from gladiator.__main__ import cli as generator_cli
+
+        return generator_cli(*generator_args)
+    except PermissionError as exc:
+        raise SystemExit(f"ERROR: {exc}") from exc
+
+    sys.stdout.write(response["stdout"])
+    sys.stderr.write(response["stderr"])
+    return response["code"]
+
+
+if __name__ == "__main__":
+    sys.exit(cli(*sys.argv[1:]))
@@ -1,72 +1,445 @@
 """Generate code using templates."""
 
+import os
 from pathlib import Path
 import re
-from sys import stdout
-from typing import Iterable, Optional
+import sys
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+from uuid import uuid4
+
+import jinja2
+from markupsafe import Markup
+
 from gladiator.parse.type import TypeDefinition
+from gladiator.profiling import phase
 
-from gladiator.options import Options
+from gladiator.options import Options, Scope
 from gladiator.prepare.enum import PreparedEnum
-from gladiator.prepare.feature import PreparedFeatureLevel
+from gladiator.prepare.extension import PreparedExtensionSet
+from gladiator.prepare.feature import link_levels, PreparedFeatureLevel
 from gladiator.prepare.resource_wrapper import PreparedResourceWrapper
 from gladiator.generate.constants import TemplateFiles
-from gladiator.generate.templates import make_template_environment, render_template
+from gladiator.generate.templates import (
+    add_loaded_template_files,
+    get_loaded_template_files,
+    make_template_environment,
+    render_template,
+    stream_template,
+    update_template_globals,
+)
+
+
+_COMPARE_CHUNK_SIZE = 1 << 16
+
+_Render = Tuple[str, Dict[str, Any]]  #: template and its context
+_Chunk = Sequence[_Render]
+
+
+def _has_same_content(path: Path, other: Path):
+    try:
+        if path.stat().st_size != other.stat().st_size:
+            return False
+        with open(path, "rb") as file, open(other, "rb") as other_file:
+            while True:
+                chunk = file.read(_COMPARE_CHUNK_SIZE)
+                if chunk != other_file.read(_COMPARE_CHUNK_SIZE):
+                    return False
+                if not chunk:
+                    return True
+    except FileNotFoundError:
+        return False
 
 
 class _Writer:
+    """Write to stdout or a file. Files are only replaced once completely
+    written and only if their content changed, so unchanged outputs keep
+    their modification time.
+    """
+
     def __init__(self, path: Optional[Path]):
-        self.path = path
-        self.file = stdout
+        self.path = Path(path) if path else None
+        self.file = sys.stdout
+        self._temp_path: Optional[Path] = None
 
     def __enter__(self):
         if self.path:
-            self.file = open(str(self.path), "w", encoding="utf-8")
+            self._temp_path = self.path.with_name(
+                f".{self.path.name}.{uuid4().hex[:8]}.tmp"
+            )
+            self.file = open(str(self._temp_path), "x", encoding="utf-8")
         return self
 
-    def __exit__(self, _t, _v, _tb):
-        if self.path:
-            self.file.close()
+    def __exit__(self, exc_type, _v, _tb):
+        if not self.path:
+            return
+
+        self.file.close()
+        if exc_type is None and not _has_same_content(self._temp_path, self.path):
+            os.replace(self._temp_path, self.path)
+        else:
+            os.unlink(self._temp_path)
 
     def write(self, text: str):
         self.file.write(text)
 
 
 _REMOVE_REPEATING_NEWLINES_PATTERN = re.compile("\n+", re.MULTILINE)
-_REMOVE_LEADING_WHITESPACE_PATTERN = re.compile("^[\t ]+", re.MULTILINE)
+_REMOVE_INNER_LEADING_WHITESPACE_PATTERN = re.compile("(?<=\n)[\t ]+")
+_COMPRESS_BUFFER_SIZE = 1 << 16
 
 
-def _compress(code: str):
-    return _REMOVE_REPEATING_NEWLINES_PATTERN.sub(
-        "\n", _REMOVE_LEADING_WHITESPACE_PATTERN.sub("", code)
-    )
+class _Compressor:
+    """Remove leading whitespace and empty lines from code fed in chunks, as if
+    the code was compressed as a whole.
+    """
+
+    def __init__(self):
+        self.at_line_start = True
+        self.after_newline = False
+
+    def compress(self, chunk: str):
+        if self.at_line_start:
+            chunk = chunk.lstrip("\t ")
+            if not chunk:
+                return chunk
+
+        chunk = _REMOVE_REPEATING_NEWLINES_PATTERN.sub(
+            "\n", _REMOVE_INNER_LEADING_WHITESPACE_PATTERN.sub("", chunk)
+        )
+        if self.after_newline:
+            chunk = chunk.lstrip("\n")
+            if not chunk:
+                return chunk
+
+        self.at_line_start = self.after_newline = chunk.endswith("\n")
+        return chunk
+
+
+def _write_compressed(output: _Writer, chunks: Iterable[str]):
+    # NOTE: rendering yields many tiny chunks, compress them in batches
+    compressor = _Compressor()
+    pending: List[str] = []
+    pending_size = 0
+    for chunk in chunks:
+        pending.append(chunk)
+        pending_size += len(chunk)
+        if pending_size >= _COMPRESS_BUFFER_SIZE:
+            with phase("compress"):
+                code = compressor.compress("".join(pending))
+            output.write(code)
+            pending.clear()
+            pending_size = 0
+    with phase("compress"):
+        code = compressor.compress("".join(pending))
+    output.write(code)
+
+
+def _escape_make_path(path: Path):
+    return str(path).replace("$", "$$").replace("#", "\\#").replace(" ", "\\ ")
+
+
+def _write_depfile(
+    options: Options, outputs: Iterable[Path], template_files: Iterable[Path]
+):
+    inputs = [Path(options.spec_file)]
+    if options.config_file:
+        inputs.append(Path(options.config_file))
+    inputs.extend(Path(path) for path in options.prune_unused)
+    inputs.extend(template_files)
+
+    targets = " ".join(_escape_make_path(Path(path).resolve()) for path in outputs)
+    paths = [_escape_make_path(path.resolve()) for path in inputs]
+    with _Writer(options.depfile) as output:
+        output.write(f"{targets}:")
+        output.write("".join(f" \\\n  {path}" for path in paths) + "\n")
+
+
+# NOTE: set before the render pool is started, so forked workers inherit it
+# instead of receiving the prepared definitions through pickling
+_PARALLEL_RENDERS: Optional[Tuple[jinja2.Environment, Sequence[_Chunk]]] = None
+
+
+def _render_chunk(index: int):
+    env, chunks = _PARALLEL_RENDERS
+    rendered = [render_template(env, t, **context) for t, context in chunks[index]]
+    return rendered, get_loaded_template_files(env)
+
+
+def _can_render_in_parallel(options: Options):
+    if options.render_jobs <= 1:
+        return False
+
+    # NOTE: imported on demand, most runs render serially
+    import multiprocessing
+
+    return "fork" in multiprocessing.get_all_start_methods()
+
+
+def _render_in_parallel(
+    env: jinja2.Environment, chunks: Sequence[_Chunk], jobs: int
+) -> List[List[str]]:
+    """Render chunks of templates on a pool of forked worker processes,
+    returning the rendered code in the order of the chunks.
+    """
+    from concurrent.futures import ProcessPoolExecutor
+    import multiprocessing
+
+    global _PARALLEL_RENDERS
+    _PARALLEL_RENDERS = (env, chunks)
+    try:
+        with ProcessPoolExecutor(
+            max_workers=min(jobs, len(chunks)) or 1,
+            mp_context=multiprocessing.get_context("fork"),
+        ) as pool:
+            results = list(pool.map(_render_chunk, range(len(chunks))))
+    finally:
+        _PARALLEL_RENDERS = None
+
+    for _, template_files in results:
+        add_loaded_template_files(env, template_files)
+    return [rendered for rendered, _ in results]
+
+
+def _split_evenly(items: Sequence[_Render], count: int) -> List[_Chunk]:
+    size = max(1, -(-len(items) // count))
+    return [items[begin : begin + size] for begin in range(0, len(items), size)]
+
+
+_LEVEL_TEMPLATES = {
+    Scope.GLOBAL: TemplateFiles.GLOBAL_LEVEL,
+    Scope.OBJECT: TemplateFiles.OBJECT_LEVEL,
+    Scope.CONTEXT: TemplateFiles.GLOBAL_LEVEL,
+}
+
+
+def _prerender(
+    options: Options,
+    env: jinja2.Environment,
+    enums: Sequence[PreparedEnum],
+    levels: Sequence[PreparedFeatureLevel],
+):
+    if not _can_render_in_parallel(options):
+        return {}
+
+    # NOTE: levels differ a lot in size, thus each is a chunk of its own
+    level_template = _LEVEL_TEMPLATES[options.scope].value
+    level_chunks = [
+        [
+            (
+                level_template,
+                {
+                    "level": level,
+                    "previous": previous,
+                    "is_first": is_first,
+                    "levels": levels,
+                },
+            )
+        ]
+        for level, previous, is_first in link_levels(levels)
+    ]
+    enum_renders = [
+        (TemplateFiles.ENUM.value, {"enum": e, "enums": enums}) for e in enums
+    ]
+    enum_chunks = _split_evenly(enum_renders, options.render_jobs * 4)
+
+    rendered = _render_in_parallel(env, level_chunks + enum_chunks, options.render_jobs)
+    return {
+        "rendered_levels": [Markup(r) for c in rendered[: len(levels)] for r in c],
+        "rendered_enums": [Markup(r) for c in rendered[len(levels) :] for r in c],
+    }
 
 
 def _generate_snippets(
-    env,
+    options: Options,
+    env: jinja2.Environment,
     types: Iterable[TypeDefinition],
-    enums: Iterable[PreparedEnum],
-    levels: Iterable[PreparedFeatureLevel],
+    enums: Sequence[PreparedEnum],
+    levels: Sequence[PreparedFeatureLevel],
     resource_wrappers: Iterable[PreparedResourceWrapper],
+    extension_set: Optional[PreparedExtensionSet],
 ):
-    yield render_template(env, TemplateFiles.BEFORE.value)
-    yield render_template(env, TemplateFiles.TYPES.value, types=types)
-    yield render_template(env, TemplateFiles.ENUM_COLLECTION.value, enums=enums)
-    yield render_template(env, TemplateFiles.LOADER.value, levels=levels)
-    yield render_template(
+    prerendered = _prerender(options, env, enums, levels)
+    rendered_enums = prerendered.get("rendered_enums")
+    rendered_levels = prerendered.get("rendered_levels")
+
+    yield from stream_template(env, TemplateFiles.BEFORE.value)
+    yield from stream_template(env, TemplateFiles.TYPES.value, types=types)
+    yield from stream_template(
+        env,
+        TemplateFiles.ENUM_COLLECTION.value,
+        enums=enums,
+        rendered_enums=rendered_enums,
+    )
+    yield from stream_template(
+        env, TemplateFiles.LOADER.value, levels=levels, rendered_levels=rendered_levels
+    )
+    yield from stream_template(
         env, TemplateFiles.RESOURCE_WRAPPERS.value, resource_wrappers=resource_wrappers
     )
-    yield render_template(env, TemplateFiles.AFTER.value)
+    if extension_set:
+        yield from stream_template(
+            env, TemplateFiles.EXTENSIONS.value, extension_set=extension_set
+        )
+    yield from stream_template(env, TemplateFiles.AFTER.value)
+
+
+_TYPES_FILE = "types.hxx"
+_ENUM_DECLARATIONS_FILE = "enums_fwd.hxx"
+_ENUMS_FILE = "enums.hxx"
+_RESOURCE_WRAPPERS_FILE = "resource_wrappers.hxx"
+_EXTENSIONS_FILE = "extensions.hxx"
+_IMPLEMENTATION_FILE = "loader.cxx"
+
+
+def _level_file(level: PreparedFeatureLevel):
+    if level.extension:
+        return f"{level.extension.lower()}.hxx"
+    if level.is_merged:
+        return "functions.hxx"
+    return f"{level.api.value}_{level.version.major}{level.version.minor}.hxx"
+
+
+def _guard(file: str):
+    return Path(file).stem.upper()
+
+
+def _plan_split_files(
+    options: Options,
+    types: Iterable[TypeDefinition],
+    enums: Iterable[PreparedEnum],
+    levels: Sequence[PreparedFeatureLevel],
+    resource_wrappers: Iterable[PreparedResourceWrapper],
+    extension_set: Optional[PreparedExtensionSet],
+):
+    headers = (
+        (_TYPES_FILE, TemplateFiles.SPLIT_TYPES, {"types": types, "levels": levels}),
+        (
+            _ENUM_DECLARATIONS_FILE,
+            TemplateFiles.SPLIT_ENUM_DECLARATIONS,
+            {"enums": enums},
+        ),
+        (_ENUMS_FILE, TemplateFiles.SPLIT_ENUMS, {"enums": enums}),
+    )
+    for file, template, context in headers:
+        yield file, template.value, {"guard": _guard(file), "includes": (), **context}
+
+    # NOTE: each level includes the previous one, so the last level offers all
+    # but the extensions
+    last_level = [_TYPES_FILE]
+    extensions = []
+    for level, previous, is_first in link_levels(levels):
+        includes = [_TYPES_FILE, _ENUM_DECLARATIONS_FILE]
+        if previous:
+            includes.append(_level_file(previous))
+        yield _level_file(level), TemplateFiles.SPLIT_LEVEL.value, {
+            "guard": _guard(_level_file(level)),
+            "includes": includes,
+            "level": level,
+            "previous": previous,
+            "is_first": is_first,
+        }
+        if level.extension:
+            extensions.append(_level_file(level))
+        else:
+            last_level = [_level_file(level)]
+
+    last_level += extensions
+    if options.generate_resource_wrappers:
+        yield _RESOURCE_WRAPPERS_FILE, TemplateFiles.SPLIT_RESOURCE_WRAPPERS.value, {
+            "guard": _guard(_RESOURCE_WRAPPERS_FILE),
+            "includes": [_ENUM_DECLARATIONS_FILE, *last_level],
+            "resource_wrappers": resource_wrappers,
+        }
+    if extension_set:
+        yield _EXTENSIONS_FILE, TemplateFiles.SPLIT_EXTENSIONS.value, {
+            "guard": _guard(_EXTENSIONS_FILE),
+            "includes": (),
+            "extension_set": extension_set,
+        }
+
+    yield _IMPLEMENTATION_FILE, TemplateFiles.SPLIT_IMPLEMENTATION.value, {
+        "includes": last_level,
+        "levels": levels,
+    }
+
+
+def _generate_split_snippets(
+    options: Options, env: jinja2.Environment, files: Sequence[Tuple[str, _Render]]
+):
+    if _can_render_in_parallel(options):
+        chunks = [[render] for _, render in files]
+        rendered = _render_in_parallel(env, chunks, options.render_jobs)
+        for (file, _), code in zip(files, rendered):
+            yield file, code
+    else:
+        for file, (template, context) in files:
+            yield file, stream_template(env, template, **context)
+
+
+def _write_split_code(options: Options, snippets: Iterable[Tuple[str, Iterable[str]]]):
+    output_dir = Path(options.output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    for file, chunks in snippets:
+        with _Writer(output_dir / file) as output:
+            _write_compressed(output, chunks)
+        yield output_dir / file
 
 
 def generate_code(
     options: Options,
     types: Iterable[TypeDefinition],
     enums: Iterable[PreparedEnum],
-    levels: Iterable[PreparedFeatureLevel],
+    levels: Sequence[PreparedFeatureLevel],
+    resource_wrappers: Iterable[PreparedResourceWrapper],
+    env: Optional[jinja2.Environment] = None,
+    extension_set: Optional[PreparedExtensionSet] = None,
+):
+    if env is None:
+        env = make_template_environment(options.template_overrides_dir, options, types)
+    else:
+        update_template_globals(env, options, types)
+
+    enums = tuple(enums)
+    with phase("render and write"):
+        outputs = _render_and_write(
+            options, env, types, enums, levels, resource_wrappers, extension_set
+        )
+
+    if options.depfile:
+        _write_depfile(options, outputs, get_loaded_template_files(env))
+
+
+def _render_and_write(
+    options: Options,
+    env: jinja2.Environment,
+    types: Iterable[TypeDefinition],
+    enums: Sequence[PreparedEnum],
+    levels: Sequence[PreparedFeatureLevel],
     resource_wrappers: Iterable[PreparedResourceWrapper],
+    extension_set: Optional[PreparedExtensionSet],
 ):
-    env = make_template_environment(options.template_overrides_dir, options, types)
-    with _Writer(options.output) as output:
-        code = "".join(_generate_snippets(env, types, enums, levels, resource_wrappers))
-        output.write(_compress(code))
+    if options.output_dir:
+        files = [
+            (file, (template, context))
+            for file, template, context in _plan_split_files(
+                options, types, enums, levels, resource_wrappers, extension_set
+            )
+        ]
+        snippets = _generate_split_snippets(options, env, files)
+        outputs = list(_write_split_code(options, snippets))
+    else:
+        with _Writer(options.output) as output:
+            _write_compressed(
+                output,
+                _generate_snippets(
+                    options,
+                    env,
+                    types,
+                    enums,
+                    levels,
+                    resource_wrappers,
+                    extension_set,
+                ),
+            )
+        outputs = [options.output]
+    return outputs
@@ -1,15 +1,16 @@
 """Constants for shared use in templates."""
 
 from enum import Enum
+from functools import lru_cache
 
-from gladiator.resources import read_resource_file
+from gladiator.resources import get_resource_table
 
 
-_ENUM_UT_OVERRIDES = [
-    ov.split(",")
-    for ov in read_resource_file("data/enum_underlying_type_overrides").split("\n")
-    if ov
-]
+@lru_cache(maxsize=None)
+def _get_enum_underlying_type_overrides():
+    return dict(
+        ov.split(",") for ov in get_resource_table("enum_underlying_type_overrides")
+    )
 
 
 class Constants:
@@ -17,7 +18,10 @@ class Constants:
     detail_namespace = "_d"
     default_namespace = "gl"
     default_resource_wrapper_namespace = "glw"
-    enum_underlying_type_overrides = dict(_ENUM_UT_OVERRIDES)
+
+    @property
+    def enum_underlying_type_overrides(self):
+        return _get_enum_underlying_type_overrides()
 
 
 class TemplateFiles(Enum):
@@ -26,8 +30,18 @@ class TemplateFiles(Enum):
     ENUM = "enum.jinja2"
     LOADER = "loader.jinja2"
     RESOURCE_WRAPPERS = "resource_wrappers.jinja2"
+    EXTENSIONS = "extensions.jinja2"
     BEFORE = "before.jinja2"
     AFTER = "after.jinja2"
+    GLOBAL_LEVEL = "loader/global_level.jinja2"
+    OBJECT_LEVEL = "loader/object_level.jinja2"
+    SPLIT_TYPES = "split/types.jinja2"
+    SPLIT_ENUM_DECLARATIONS = "split/enum_declarations.jinja2"
+    SPLIT_ENUMS = "split/enums.jinja2"
+    SPLIT_LEVEL = "split/level.jinja2"
+    SPLIT_RESOURCE_WRAPPERS = "split/resource_wrappers.jinja2"
+    SPLIT_EXTENSIONS = "split/extensions.jinja2"
+    SPLIT_IMPLEMENTATION = "split/implementation.jinja2"
 
     @classmethod
     def overrides(cls):
@@ -1,16 +1,20 @@
 """Template preparation and rendering."""
 
+import os
 from pathlib import Path
-from typing import Iterable, Optional, TYPE_CHECKING
+from typing import Iterable, Iterator, List, Optional, Sequence, TYPE_CHECKING
 
 import jinja2
+from jinja2.bccache import Bucket
 
+from gladiator.cache import get_bytecode_path, get_cache_dir, write_cache_file
 from gladiator.generate.constants import Constants, TemplateFiles
 from gladiator.parse.feature import FeatureApi, FeatureVersion
 from gladiator.parse.type import TypeDefinition
 from gladiator.prepare.command import CommandType, ConversionType
 from gladiator.prepare.resource_wrapper import ResourceWrapperType
-from gladiator.options import Scope
+from gladiator.options import DebugOutput, Scope
+from gladiator.profiling import phase
 from gladiator.resources import BASE_RESOURCE_PATH
 
 if TYPE_CHECKING:
@@ -18,6 +22,7 @@ if TYPE_CHECKING:
 
 
 BASE_TEMPLATE_DIR = BASE_RESOURCE_PATH / "templates"
+PREBUILT_BYTECODE_DIR = BASE_RESOURCE_PATH / "bytecode"
 
 
 def _make_api_version_identifier(
@@ -30,10 +35,11 @@ def _make_api_version_identifier(
 def _make_globals(options: "Options", types: Iterable[TypeDefinition]):
     return {
         "options": options,
-        "constants": Constants,
+        "constants": Constants(),
         "templates": TemplateFiles,
         "opengl_types": [t.name for t in types],
         "Scope": Scope,
+        "DebugOutput": DebugOutput,
         "CommandType": CommandType,
         "ConversionType": ConversionType,
         "ResourceWrapperType": ResourceWrapperType,
@@ -43,20 +49,126 @@ def _make_globals(options: "Options", types: Iterable[TypeDefinition]):
     }
 
 
+class _TrackingLoader(jinja2.FileSystemLoader):
+    """Record the files of all templates that were loaded."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.loaded_files: List[Path] = []
+
+    def load(self, environment: jinja2.Environment, name: str, globals=None):
+        with phase("load templates"):
+            return super().load(environment, name, globals)
+
+    def get_source(self, environment: jinja2.Environment, template: str):
+        source, filename, uptodate = super().get_source(environment, template)
+        path = Path(filename)
+        if path not in self.loaded_files:
+            self.loaded_files.append(path)
+        return source, filename, uptodate
+
+
+class TemplateBytecodeCache(jinja2.BytecodeCache):
+    """Cache compiled templates in the given dir, preferring the bytecode
+    prebuilt for the default templates. Keyed by template name and content
+    instead of path, so prebuilt bytecode remains valid wherever the package
+    is installed.
+    """
+
+    def __init__(self, cache_dir: Optional[Path], prebuilt_dir=PREBUILT_BYTECODE_DIR):
+        self.cache_dir = cache_dir
+        self.prebuilt_dir = prebuilt_dir
+
+    def get_bucket(
+        self,
+        environment: jinja2.Environment,
+        name: str,
+        filename: Optional[str],
+        source: str,
+    ) -> Bucket:
+        checksum = self.get_source_checksum(source)
+        bucket = Bucket(environment, self.get_cache_key(f"{name}|{checksum}"), checksum)
+        self.load_bytecode(bucket)
+        return bucket
+
+    def load_bytecode(self, bucket: Bucket):
+        for directory in (self.prebuilt_dir, self.cache_dir):
+            if directory is None:
+                continue
+
+            path = get_bytecode_path(directory, bucket.key)
+            try:
+                with open(path, "rb") as file:
+                    bucket.load_bytecode(file)
+            except OSError:
+                continue
+
+            if bucket.code is not None:
+                if directory == self.cache_dir:
+                    os.utime(path)  # NOTE: mark as recently used for pruning
+                return
+
+    def dump_bytecode(self, bucket: Bucket):
+        if self.cache_dir is not None:
+            path = get_bytecode_path(self.cache_dir, bucket.key)
+            write_cache_file(path, bucket.write_bytecode)
+
+
+def make_loader_environment(
+    overrides: Optional[Path],
+    cache_dir: Optional[Path] = None,
+    bytecode_cache: Optional[jinja2.BytecodeCache] = None,
+):
+    """Make a Jinja2 environment with a file system loader respecting possible
+    template overrides, but without globals. Compiled templates are cached in
+    the given dir, if any, or by the given bytecode cache.
+    """
+    # NOTE: the loader searches its paths in order, so overrides come first
+    includes = ([overrides] if overrides else []) + [BASE_TEMPLATE_DIR]
+    return jinja2.Environment(
+        loader=_TrackingLoader(includes, followlinks=True),
+        autoescape=True,
+        bytecode_cache=bytecode_cache or TemplateBytecodeCache(cache_dir),
+    )
+
+
+def update_template_globals(
+    env: jinja2.Environment, options: "Options", types: Iterable[TypeDefinition]
+):
+    """Predefine the globals for rendering code for the given options. Templates
+    loaded before see the new globals as well.
+    """
+    env.globals.update(_make_globals(options, types))
+
+
 def make_template_environment(
     overrides: Optional[Path], options: "Options", types: Iterable[TypeDefinition]
 ):
     """Make a Jinja2 environment with a file system loader respecting possible
     template overrides and predefined globals.
     """
-    includes = [BASE_TEMPLATE_DIR] + ([overrides] if overrides else [])
-    env = jinja2.Environment(
-        loader=jinja2.FileSystemLoader(includes, followlinks=True), autoescape=True
-    )
-    env.globals.update(_make_globals(options, types))
+    env = make_loader_environment(overrides, get_cache_dir(options))
+    update_template_globals(env, options, types)
     return env
 
 
+def get_loaded_template_files(env: jinja2.Environment) -> Sequence[Path]:
+    """Get the files of all templates the given environment loaded so far."""
+    return tuple(env.loader.loaded_files)
+
+
+def add_loaded_template_files(env: jinja2.Environment, files: Iterable[Path]):
+    """Record files of templates loaded by a copy of the given environment."""
+    for path in files:
+        if path not in env.loader.loaded_files:
+            env.loader.loaded_files.append(path)
+
+
 def render_template(env: jinja2.Environment, template: str, **context):
     """Render the given template with an additional context being made available in it."""
     return env.get_template(template).render(**context)
+
+
+def stream_template(env: jinja2.Environment, template: str, **context) -> Iterator[str]:
+    """Render the given template in chunks as they are produced."""
+    return env.get_template(template).generate(**context)
@@ -1,13 +1,12 @@
 """Generator options."""
 
+from argparse import ArgumentParser, ArgumentTypeError
 from enum import Enum
 from pathlib import Path
 from typing import Optional, Sequence
 
 import attr
 
-from configargparse import ArgParser, YAMLConfigFileParser, ArgumentTypeError
-
 from gladiator.generate.constants import TemplateFiles
 from gladiator.mixins import CannotConvertToEnum, StringToEnumMixin
 from gladiator.parse.feature import FeatureApi, FeatureVersion
@@ -28,6 +27,37 @@ class Scope(StringToEnumMixin, Enum):
 
     GLOBAL = "global"
     OBJECT = "object"
+    CONTEXT = "context"
+
+
+class DebugOutput(StringToEnumMixin, Enum):
+    """All supported modes of delivering debug messages."""
+
+    SYNCHRONOUS = "synchronous"
+    ASYNCHRONOUS = "asynchronous"
+
+
+class DebugSeverity(StringToEnumMixin, Enum):
+    """All severities of debug messages."""
+
+    HIGH = "high"
+    MEDIUM = "medium"
+    LOW = "low"
+    NOTIFICATION = "notification"
+
+
+class DebugType(StringToEnumMixin, Enum):
+    """All types of debug messages."""
+
+    ERROR = "error"
+    DEPRECATED_BEHAVIOR = "deprecated_behavior"
+    UNDEFINED_BEHAVIOR = "undefined_behavior"
+    PORTABILITY = "portability"
+    PERFORMANCE = "performance"
+    OTHER = "other"
+    MARKER = "marker"
+    PUSH_GROUP = "push_group"
+    POP_GROUP = "pop_group"
 
 
 def _to_version(value: str):
@@ -71,23 +101,48 @@ class Options:
     # feature levels
     api: Sequence[FeatureApi] = ()
     version: Sequence[FeatureVersion] = ()
+    extensions: Sequence[str] = ()
+    prune_unused: Sequence[Path] = ()
+    prune_report: Optional[Path] = None
 
     # semantics
     scope: Scope = Scope.GLOBAL
+    lazy_load: bool = False
+    loader_table: bool = False
     enum_namespace: Optional[str] = None
     loader_or_class_namespace: Optional[str] = None
     loader_or_class_name_template: Optional[str] = None  #: {api} {major} {minor}
     no_type_translation: bool = False
 
+    # debug output
+    debug_output: DebugOutput = DebugOutput.SYNCHRONOUS
+    debug_severities: Sequence[DebugSeverity] = (
+        DebugSeverity.HIGH,
+        DebugSeverity.MEDIUM,
+        DebugSeverity.LOW,
+    )
+    debug_types: Sequence[DebugType] = ()  #: all if empty
+
     # misc
     generate_resource_wrappers: bool = False
+    extension_queries: bool = False
+    instrument: bool = False
     resource_wrapper_namespace: Optional[str] = None
     template_overrides_dir: Optional[Path] = None
     output: Optional[Path] = None
+    output_dir: Optional[Path] = None
+    depfile: Optional[Path] = None
+    render_jobs: int = 1
+    memory_map: bool = False
+    no_cache: bool = False
+    cache_dir: Optional[Path] = None
+    profile: bool = False
+    profile_json: Optional[Path] = None
+    profile_stats: Optional[Path] = None
     config_file: Optional[str] = None
 
 
-def add_feature_level_options(cli: ArgParser):
+def add_feature_level_options(cli: ArgumentParser, required: bool = True):
     """Add feature level options to the given argument parser"""
     cli.add_argument(
         "--spec-file",
@@ -97,14 +152,14 @@ def add_feature_level_options(cli: ArgParser):
     cli.add_argument(
         "--api",
         type=_enum(FeatureApi),
-        required=True,
+        required=required,
         nargs="+",
         help=f"specifying multiple intersects the features {FeatureApi.options()}",
     )
     cli.add_argument(
         "--version",
         type=_to_version,
-        required=True,
+        required=required,
         nargs="+",
         help="versions for the given APIs (format: <major>.<minor>)",
     )
@@ -112,6 +167,9 @@ def add_feature_level_options(cli: ArgParser):
 
 def make_argument_parser():
     """Define the CLI."""
+    # NOTE: imported on first use, so tools sharing these options start faster
+    from configargparse import ArgParser, YAMLConfigFileParser
+
     cli = ArgParser(
         config_file_parser_class=YAMLConfigFileParser,
         add_help=True,
@@ -147,6 +205,25 @@ def make_argument_parser():
 
     levels = cli.add_argument_group("Feature level options")
     add_feature_level_options(levels)
+    levels.add_argument(
+        "--extensions",
+        nargs="+",
+        default=(),
+        help="extensions to load separately from the feature levels (e.g. GL_KHR_debug)",
+    )
+    levels.add_argument(
+        "--prune-unused",
+        type=Path,
+        nargs="+",
+        default=(),
+        help="generate only commands whose wrapper names appear in the given C++ sources or symbol lists",
+    )
+    levels.add_argument(
+        "--prune-report",
+        type=Path,
+        default=None,
+        help="file to write the kept and pruned commands and enums to as JSON (requires --prune-unused)",
+    )
 
     sem = cli.add_argument_group("Semantic options")
     sem.add_argument(
@@ -155,6 +232,18 @@ def make_argument_parser():
         default=Scope.GLOBAL,
         help=f"scope of OpenGL wrappers {Scope.options()}",
     )
+    sem.add_argument(
+        "--lazy-load",
+        action="store_true",
+        default=False,
+        help="resolve functions on their first call instead of when loading (requires global scope)",
+    )
+    sem.add_argument(
+        "--loader-table",
+        action="store_true",
+        default=False,
+        help="store functions in a single table and load each level in a loop (requires global scope)",
+    )
     sem.add_argument("--enum-namespace", default=None, help="namespace enums reside in")
     sem.add_argument(
         "--loader-or-class-namespace",
@@ -173,6 +262,28 @@ def make_argument_parser():
         help="do not translate OpenGL types (e.g. GLubyte) to cstdint defs (e.g. std::uint8_t)",
     )
 
+    debug = cli.add_argument_group("Debug output options")
+    debug.add_argument(
+        "--debug-output",
+        type=_enum(DebugOutput),
+        default=DebugOutput.SYNCHRONOUS,
+        help=f"delivery of debug messages in debug builds {DebugOutput.options()}",
+    )
+    debug.add_argument(
+        "--debug-severities",
+        type=_enum(DebugSeverity),
+        nargs="+",
+        default=(DebugSeverity.HIGH, DebugSeverity.MEDIUM, DebugSeverity.LOW),
+        help=f"severities of debug messages the driver reports {DebugSeverity.options()}",
+    )
+    debug.add_argument(
+        "--debug-types",
+        type=_enum(DebugType),
+        nargs="+",
+        default=(),
+        help=f"types of debug messages the driver reports (default: all) {DebugType.options()}",
+    )
+
     misc = cli.add_argument_group("Miscellaneous options")
     misc.add_argument(
         "--generate-resource-wrappers",
@@ -180,6 +291,18 @@ def make_argument_parser():
         default=False,
         help="generate scoped resource wrappers",
     )
+    misc.add_argument(
+        "--extension-queries",
+        action="store_true",
+        default=False,
+        help="generate has_extension() queries of the extensions supported at runtime",
+    )
+    misc.add_argument(
+        "--instrument",
+        action="store_true",
+        default=False,
+        help="generate wrappers counting their calls if GLADIATOR_INSTRUMENT is defined",
+    )
     misc.add_argument(
         "--resource-wrapper-namespace",
         default=None,
@@ -197,5 +320,61 @@ def make_argument_parser():
         default=None,
         help="file to write code to (otherwise writes to stdout)",
     )
+    misc.add_argument(
+        "--output-dir",
+        type=Path,
+        default=None,
+        help="dir to write code split into headers per feature level and a single source file to",
+    )
+    misc.add_argument(
+        "--depfile",
+        type=Path,
+        default=None,
+        help="file to write Make/Ninja dependencies of the output to (requires --output or --output-dir)",
+    )
+    misc.add_argument(
+        "--render-jobs",
+        type=int,
+        default=1,
+        help="number of processes rendering enums and feature levels (default: 1)",
+    )
+    misc.add_argument(
+        "--memory-map",
+        action="store_true",
+        default=False,
+        help="memory-map the spec file instead of reading it",
+    )
+    misc.add_argument(
+        "--no-cache",
+        action="store_true",
+        default=False,
+        help="always parse the spec file instead of loading it from the cache",
+    )
+    misc.add_argument(
+        "--cache-dir",
+        type=Path,
+        default=None,
+        help="dir to cache parsed spec files in (default: $GLADIATOR_CACHE_DIR or ~/.cache/gladiator)",
+    )
+
+    prof = cli.add_argument_group("Profiling options")
+    prof.add_argument(
+        "--profile",
+        action="store_true",
+        default=False,
+        help="print wall time and peak memory of each phase to stderr (slows down the run)",
+    )
+    prof.add_argument(
+        "--profile-json",
+        type=Path,
+        default=None,
+        help="file to write wall time and peak memory of each phase to as JSON",
+    )
+    prof.add_argument(
+        "--profile-stats",
+        type=Path,
+        default=None,
+        help="file to dump cProfile stats to (see pstats)",
+    )
 
     return cli
@@ -1,13 +1,16 @@
 """Parse OpenGL enum definitions required by feature levels."""
 
 from copy import copy
-from typing import Optional, Iterable, Sequence
+from functools import lru_cache
+from operator import attrgetter
+from typing import Dict, Optional, Iterable, Sequence, Tuple, Union
 import xml.etree.ElementTree as xml
 
 import attr
 
 from gladiator.optional import OptionalValue
-from gladiator.resources import read_resource_file
+from gladiator.parse.index import IndexedCommand, SpecIndex
+from gladiator.resources import get_resource_table
 
 
 @attr.s(auto_attribs=True, kw_only=True, slots=True, frozen=True)
@@ -38,6 +41,12 @@ class Command:
     params: Iterable[Parameter]
 
 
+EncodedType = Tuple[str, Optional[str], Optional[str], Optional[str]]
+EncodedCommand = Tuple[
+    str, EncodedType, Tuple[Tuple[str, EncodedType, Optional[str]], ...]
+]
+
+
 def _parse_front_modifiers(node: xml.Element, ptype: xml.Element):
     fragments = tuple(node.itertext())
     ptype_index = fragments.index(ptype.text)
@@ -52,14 +61,15 @@ def _strip_name_tag(param: xml.Element):
     return param
 
 
-_KNOWN_LOW_LEVEL_TYPES = [
-    t for t in read_resource_file("data/low_level_types").split("\n") if t
-]
+@lru_cache(maxsize=None)
+def _get_known_low_level_types():
+    return frozenset(get_resource_table("low_level_types"))
 
 
 def _locate_type(fragments: Sequence[str]):
+    known = _get_known_low_level_types()
     for index, fragment in enumerate(fragments):
-        if fragment in _KNOWN_LOW_LEVEL_TYPES:
+        if fragment in known:
             return index
     return -1
 
@@ -88,7 +98,12 @@ def _parse_named_type(param: xml.Element, ptype: xml.Element):
     )
 
 
-def _parse_type(param: xml.Element):
+def _strip_modifiers(modifiers: Optional[str]):
+    stripped = modifiers.strip() if modifiers else None
+    return stripped or None
+
+
+def _parse_new_type(param: xml.Element) -> EncodedType:
     param = _strip_name_tag(param)
     ptype = param.find("ptype")
     if ptype is not None:
@@ -96,14 +111,60 @@ def _parse_type(param: xml.Element):
     else:
         low_level, fmod, bmod = _parse_unnamed_type(param)
 
-    return Type(
-        low_level=low_level,
-        high_level=param.attrib.get("group"),
-        front_modifiers=OptionalValue(fmod).map(lambda t: t.strip()).truthy_or_none,
-        back_modifiers=OptionalValue(bmod).map(lambda t: t.strip()).truthy_or_none,
+    return (
+        low_level,
+        param.attrib.get("group"),
+        _strip_modifiers(fmod),
+        _strip_modifiers(bmod),
+    )
+
+
+RawType = Tuple[
+    Optional[str], Optional[str], Tuple[Tuple[str, Optional[str], Optional[str]], ...]
+]
+
+# NOTE: thousands of parameters share the same few hundred types, thus types
+# are memoized on their markup and the same instance is shared by all of them
+_TYPES_BY_MARKUP: Dict[RawType, Type] = {}
+_INTERNED_TYPES: Dict[EncodedType, Type] = {}
+
+
+def clear_caches():
+    """Forget all memoized types, e.g. to measure parsing them."""
+    _TYPES_BY_MARKUP.clear()
+    _INTERNED_TYPES.clear()
+
+
+def _get_markup(param: xml.Element) -> RawType:
+    # NOTE: the name and its tail are not part of the type
+    return (
+        param.attrib.get("group"),
+        param.text,
+        tuple((c.tag, c.text, c.tail) for c in param if c.tag != "name"),
     )
 
 
+def _intern_type(encoded: EncodedType):
+    type_ = _INTERNED_TYPES.get(encoded)
+    if type_ is None:
+        low_level, high_level, front_modifiers, back_modifiers = encoded
+        type_ = _INTERNED_TYPES[encoded] = Type(
+            low_level=low_level,
+            high_level=high_level,
+            front_modifiers=front_modifiers,
+            back_modifiers=back_modifiers,
+        )
+    return type_
+
+
+def _parse_type(param: xml.Element):
+    markup = _get_markup(param)
+    type_ = _TYPES_BY_MARKUP.get(markup)
+    if type_ is None:
+        type_ = _TYPES_BY_MARKUP[markup] = _intern_type(_parse_new_type(param))
+    return type_
+
+
 def _parse_name(node: xml.Element):
     return OptionalValue(node.find("name")).map(lambda n: n.text).value
 
@@ -116,7 +177,7 @@ def _parse_parameters(command_node: xml.Element):
     for node in command_node:
         if node.tag == "param":
             yield Parameter(
-                name=OptionalValue(node.find("name")).map(lambda n: n.text).value,
+                name=_parse_name(node),
                 type_=_parse_type(node),
                 length=node.attrib.get("len"),
             )
@@ -130,11 +191,65 @@ def parse_command(node: xml.Element):
     )
 
 
+def _encode_type(type_: Type) -> EncodedType:
+    return (
+        type_.low_level,
+        type_.high_level,
+        type_.front_modifiers,
+        type_.back_modifiers,
+    )
+
+
+def encode_command(command: Command) -> EncodedCommand:
+    """Flatten the given command into builtin types, e.g. for caching."""
+    return (
+        command.name,
+        _encode_type(command.return_type),
+        tuple(
+            (param.name, _encode_type(param.type_), param.length)
+            for param in command.params
+        ),
+    )
+
+
+def decode_command(encoded: EncodedCommand) -> Command:
+    """Restore a command flattened by encode_command."""
+    name, return_type, params = encoded
+    return Command(
+        name=name,
+        return_type=_intern_type(return_type),
+        params=tuple(
+            Parameter(name=param_name, type_=_intern_type(type_), length=length)
+            for param_name, type_, length in params
+        ),
+    )
+
+
+def parse_indexed_command(entry: IndexedCommand) -> Command:
+    """Parse the command definition of the given index entry."""
+    if isinstance(entry.definition, xml.Element):
+        return parse_command(entry.definition)
+    return decode_command(entry.definition)
+
+
+def _parse_indexed_commands(required_commands: Iterable[str], index: SpecIndex):
+    entries = (index.commands.get(name) for name in set(required_commands))
+    for entry in sorted(filter(None, entries), key=attrgetter("position")):
+        yield parse_indexed_command(entry)
+
+
 def parse_required_commands(
     required_commands: Iterable[str],
-    container_node: xml.Element,
+    container_node: Union[xml.Element, SpecIndex],
 ):
-    """Parse all required commands and yield their names, parameters and return types."""
+    """Parse all required commands and yield their names, parameters and return types.
+    Commands are looked up directly if given the spec index instead of the
+    <commands> node.
+    """
+    if isinstance(container_node, SpecIndex):
+        yield from _parse_indexed_commands(required_commands, container_node)
+        return
+
     for node in container_node:
         if _parse_name(OptionalValue(node.find("proto")).value) in required_commands:
             yield parse_command(node)
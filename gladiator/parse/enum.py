@@ -1,12 +1,14 @@
 """Parse OpenGL enum definitions required by feature levels."""
 
 from collections import defaultdict
-from typing import Dict, Iterable, List
+from operator import attrgetter
+from typing import Dict, Iterable, List, Set, Union
 import xml.etree.ElementTree as xml
 
 import attr
 
 from gladiator.optional import OptionalValue
+from gladiator.parse.index import SpecIndex
 
 
 @attr.s(auto_attribs=True, kw_only=True, slots=True, frozen=True)
@@ -48,18 +50,43 @@ def _add_value_to_groups(value_node: xml.Element, result: Dict[str, List[EnumVal
         result[declared_group].append(value)
 
 
+def _parse_indexed_enums(required_enums: Iterable[str], index: SpecIndex):
+    result: Dict[str, List[EnumValue]] = defaultdict(list)
+    candidates = (
+        value
+        for name in set(required_enums)
+        for value in index.enums.get(name, ())
+        if value.type_ != "ull"
+    )
+
+    for candidate in sorted(candidates, key=attrgetter("position")):
+        value = EnumValue(name=candidate.name, value=candidate.value)
+        for declared_group in candidate.groups:
+            result[declared_group].append(value)
+
+    for group, values in result.items():
+        is_bitmask = index.bitmask_groups.get(group, False)
+        yield Enum(name=group, is_bitmask=is_bitmask, values=values)
+
+
 def parse_required_enums(
     required_enums: Iterable[str],
-    enums: Iterable[xml.Element],
+    enums: Union[Iterable[xml.Element], SpecIndex],
 ):
-    """Parse all required enums and yield their names and values."""
+    """Parse all required enums and yield their names and values. Values are
+    looked up directly if given the spec index instead of the <enums> nodes.
+    """
+    if isinstance(enums, SpecIndex):
+        yield from _parse_indexed_enums(required_enums, enums)
+        return
+
     result: Dict[str, List[EnumValue]] = defaultdict(list)
-    found_bitmasks: List[str] = []
+    found_bitmasks: Set[str] = set()
 
     for enum_node in enums:
         group = enum_node.attrib.get("group")
         if enum_node.attrib.get("type") == "bitmask" and group:
-            found_bitmasks.append(group)
+            found_bitmasks.add(group)
 
         for value_node in enum_node:
             if _is_eligible(value_node, required_enums):
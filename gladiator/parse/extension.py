@@ -1,16 +1,20 @@
 """Parse OpenGL extension definitions."""
 
-from typing import Iterable, Optional
+from typing import Dict, Iterable, List, Optional, Tuple
 import xml.etree.ElementTree as xml
 
 import attr
 
+from gladiator.mixins import CannotConvertToEnum
 from gladiator.parse.feature import (
     apply_requirements,
+    Feature,
     FeatureApi,
     FeatureVersion,
     RequirementMapping,
+    _parse_name,
 )
+from gladiator.parse.index import ExtensionChange, IndexedExtension, SpecIndex
 
 
 @attr.s(auto_attribs=True, kw_only=True, slots=True, frozen=True)
@@ -19,6 +23,21 @@ class SupportedApi:
     min_version: Optional[FeatureVersion] = None
     max_version: Optional[FeatureVersion] = None
 
+    def supports(self, feature: Feature):
+        """Determine whether the given feature level may use the extension."""
+        version = (feature.version.major, feature.version.minor)
+        return (
+            feature.api == self.api
+            and not (
+                self.min_version
+                and version < (self.min_version.major, self.min_version.minor)
+            )
+            and not (
+                self.max_version
+                and version > (self.max_version.major, self.max_version.minor)
+            )
+        )
+
 
 @attr.s(auto_attribs=True, kw_only=True, slots=True, frozen=True)
 class Extension:
@@ -27,9 +46,13 @@ class Extension:
     required_enums: Iterable[str]
     required_commands: Iterable[str]
 
+    def is_supported(self, feature: Feature):
+        """Determine whether the given feature level may use the extension."""
+        return any(s.supports(feature) for s in self.supported_apis)
+
 
-def _parse_supported_apis(node: xml.Element):
-    for supported in node.attrib["supported"].split("|"):
+def _parse_supported_apis(supported_apis: str):
+    for supported in supported_apis.split("|"):
         if supported == "glcore":
             yield SupportedApi(
                 api=FeatureApi.GL, min_version=FeatureVersion(major=3, minor=1)
@@ -39,7 +62,64 @@ def _parse_supported_apis(node: xml.Element):
                 api=FeatureApi.GL, max_version=FeatureVersion(major=3, minor=0)
             )
         else:
-            yield SupportedApi(api=FeatureApi.from_string(supported))
+            try:
+                yield SupportedApi(api=FeatureApi.from_string(supported))
+            except CannotConvertToEnum:
+                pass  # NOTE: e.g. disabled extensions
+
+
+def parse_extension_changes(node: xml.Element) -> Tuple[ExtensionChange, ...]:
+    """Parse the requirements of an extension and the APIs they are limited to."""
+    return tuple(
+        (block.attrib.get("api"), item.tag, _parse_name(item))
+        for block in node
+        if block.tag == "require"
+        for item in block
+        if item.tag in ("enum", "command")
+    )
+
+
+def _resolve_indexed_extension(entry: IndexedExtension, api: FeatureApi):
+    # NOTE: a name may be listed by multiple blocks of the same extension
+    enums: Dict[str, None] = {}
+    commands: Dict[str, None] = {}
+    targets = {"enum": enums, "command": commands}
+    for required_api, kind, name in entry.changes:
+        if required_api in (None, api.value):
+            targets[kind][name] = None
+
+    return Extension(
+        name=entry.name,
+        supported_apis=tuple(_parse_supported_apis(entry.supported)),
+        required_enums=tuple(enums),
+        required_commands=tuple(commands),
+    )
+
+
+def get_extension(index: SpecIndex, name: str, api: FeatureApi) -> Optional[Extension]:
+    """Look up an extension in the index and resolve its requirements for the
+    given API.
+    """
+    entry = index.extensions.get(name)
+    return _resolve_indexed_extension(entry, api) if entry else None
+
+
+def get_supported_extension_names(
+    index: SpecIndex, features: Iterable[Feature]
+) -> List[str]:
+    """Get the names of all extensions of the index that any of the given
+    feature levels may use, in document order.
+    """
+    features = tuple(features)
+    return [
+        name
+        for name, entry in index.extensions.items()
+        if any(
+            supported.supports(feature)
+            for supported in _parse_supported_apis(entry.supported)
+            for feature in features
+        )
+    ]
 
 
 def parse_required_extensions(
@@ -49,7 +129,7 @@ def parse_required_extensions(
     for ext_node in extensions_root:
         name = ext_node.attrib["name"]
         if name in required_extensions:
-            supported = tuple(_parse_supported_apis(ext_node))
+            supported = tuple(_parse_supported_apis(ext_node.attrib["supported"]))
             enums: RequirementMapping = {}
             commands: RequirementMapping = {}
             apply_requirements(
@@ -1,13 +1,23 @@
 """Parse OpenGL feature definitions."""
 
 from enum import Enum
-from typing import MutableMapping, Iterable
+from typing import (
+    Dict,
+    List,
+    MutableMapping,
+    Iterable,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
 import xml.etree.ElementTree as xml
 
 import attr
 
 from gladiator.mixins import StringToEnumMixin
 from gladiator.optional import OptionalValue
+from gladiator.parse.index import SpecIndex
 
 
 class FeatureApi(StringToEnumMixin, Enum):
@@ -97,6 +107,35 @@ def _parse_name(node: xml.Element) -> str:
     return OptionalValue(node.attrib.get("name")).value
 
 
+FeatureChange = Tuple[str, str, str]  #: (require|remove, enum|command, name)
+
+
+def parse_feature_changes(node: xml.Element) -> Tuple[FeatureChange, ...]:
+    """Parse the requirements and removals of a feature or extension in order."""
+    return tuple(
+        (block.tag, item.tag, _parse_name(item))
+        for block in node
+        if block.tag in ("require", "remove")
+        for item in block
+        if item.tag in ("enum", "command")
+    )
+
+
+def apply_changes(
+    changes: Iterable[FeatureChange],
+    version: FeatureVersion,
+    current_enums: RequirementMapping,
+    current_commands: RequirementMapping,
+):
+    """Apply parsed requirements and removals of a new feature."""
+    targets = {"enum": current_enums, "command": current_commands}
+    for action, kind, name in changes:
+        if action == "require":
+            targets[kind][name] = version
+        else:
+            del targets[kind][name]
+
+
 def apply_requirements(
     new_feature: xml.Element,
     version: FeatureVersion,
@@ -108,34 +147,126 @@ def apply_requirements(
     For example, core OpenGL 3.1 removes the fixed function pipeline entirely
     but adds several other functions.
     """
-    for type_ in new_feature:
-        if type_.tag == "require":
-            for requirement in type_:
-                if requirement.tag == "enum":
-                    current_enums[_parse_name(requirement)] = version
-                elif requirement.tag == "command":
-                    current_commands[_parse_name(requirement)] = version
-        elif type_.tag == "remove":
-            for remove in type_:
-                if remove.tag == "enum":
-                    del current_enums[_parse_name(remove)]
-                elif remove.tag == "command":
-                    del current_commands[_parse_name(remove)]
+    apply_changes(
+        parse_feature_changes(new_feature), version, current_enums, current_commands
+    )
 
 
-def get_feature_requirements(
+@attr.s(auto_attribs=True, kw_only=True, slots=True, frozen=True)
+class Availability:
+    """A continuous span of versions an enum or command is part of an API in."""
+
+    kind: str  #: enum or command
+    name: str
+    introduced: FeatureVersion
+    removed: Optional[FeatureVersion]
+    required: Sequence[FeatureVersion]  #: versions requiring it within the span
+
+    def is_available(self, version: FeatureVersion):
+        """Determine if the span covers the given version."""
+        return self.introduced <= version and (
+            self.removed is None or version < self.removed
+        )
+
+    def required_by(self, version: FeatureVersion):
+        """Get the latest version up to the given one that required it."""
+        return next(v for v in reversed(self.required) if v <= version)
+
+
+@attr.s(auto_attribs=True, kw_only=True, slots=True, frozen=True)
+class FeatureTimeline:
+    """All spans of availability of an API's enums and commands, ordered by the
+    point they started at while replaying the API's features.
+    """
+
+    api: FeatureApi
+    versions: Sequence[FeatureVersion]
+    spans: Sequence[Availability]
+
+    def resolve(self, version: FeatureVersion):
+        """Get the requirements of the given version. Equivalent to replaying
+        all compatible features in ascending order.
+        """
+        targets: Dict[str, RequirementMapping] = {"enum": {}, "command": {}}
+        for span in self.spans:
+            if span.is_available(version):
+                targets[span.kind][span.name] = span.required_by(version)
+        return Requirements(enums=targets["enum"], commands=targets["command"])
+
+
+def build_feature_timeline(
+    api: FeatureApi, features: Iterable[Tuple[Feature, Iterable[FeatureChange]]]
+) -> FeatureTimeline:
+    """Replay the changes of all features of the given API once and record the
+    version every enum and command was introduced and removed in.
+    """
+    api_features = sorted(
+        ((f, changes) for f, changes in features if f.api == api),
+        key=lambda t: t[0].version,
+    )
+    spans: List[Availability] = []
+    available: Dict[Tuple[str, str], int] = {}  #: position of the open span
+
+    for feature, changes in api_features:
+        for action, kind, name in changes:
+            position = available.get((kind, name))
+            if action == "require" and position is None:
+                available[(kind, name)] = len(spans)
+                spans.append(
+                    Availability(
+                        kind=kind,
+                        name=name,
+                        introduced=feature.version,
+                        removed=None,
+                        required=(feature.version,),
+                    )
+                )
+            elif action == "require":
+                required = (*spans[position].required, feature.version)
+                spans[position] = attr.evolve(spans[position], required=required)
+            else:
+                position = available.pop((kind, name))
+                spans[position] = attr.evolve(spans[position], removed=feature.version)
+
+    return FeatureTimeline(
+        api=api,
+        versions=tuple(f.version for f, _ in api_features),
+        spans=tuple(spans),
+    )
+
+
+def get_feature_timeline(index: SpecIndex, api: FeatureApi) -> FeatureTimeline:
+    """Get the timeline of the given API, building it on first use."""
+    if api not in index.timelines:
+        index.timelines[api] = build_feature_timeline(api, index.features.items())
+    return index.timelines[api]
+
+
+def _get_node_requirements(
     requested_feature: Feature, features_root: Iterable[xml.Element]
 ):
-    """Get the aggregated enums and commands of all features that are compatible
-    with the requested feature level. These enums and commands still contain the
-    feature level they originally came from.
-    """
     enums: RequirementMapping = {}
     commands: RequirementMapping = {}
 
-    for feature_node in features_root:
-        current_feature = _parse_feature(feature_node)
-        if current_feature and is_compatible(requested_feature, current_feature):
-            apply_requirements(feature_node, current_feature.version, enums, commands)
+    for node in features_root:
+        feature = _parse_feature(node)
+        if feature and is_compatible(requested_feature, feature):
+            apply_requirements(node, feature.version, enums, commands)
 
     return Requirements(enums=enums, commands=commands)
+
+
+def get_feature_requirements(
+    requested_feature: Feature,
+    features_root: Union[Iterable[xml.Element], SpecIndex],
+):
+    """Get the aggregated enums and commands of all features that are compatible
+    with the requested feature level. These enums and commands still contain the
+    feature level they originally came from. Resolved through the API's feature
+    timeline if given the spec index.
+    """
+    if isinstance(features_root, SpecIndex):
+        timeline = get_feature_timeline(features_root, requested_feature.api)
+        return timeline.resolve(requested_feature.version)
+
+    return _get_node_requirements(requested_feature, features_root)
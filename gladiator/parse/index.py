@@ -0,0 +1,65 @@
+"""Lookup tables over the OpenGL spec."""
+
+from typing import Dict, Mapping, Optional, Sequence, Tuple, TYPE_CHECKING, Union
+import xml.etree.ElementTree as xml
+
+import attr
+
+if TYPE_CHECKING:
+    from gladiator.parse.command import EncodedCommand
+    from gladiator.parse.feature import (
+        Feature,
+        FeatureApi,
+        FeatureChange,
+        FeatureTimeline,
+    )
+    from gladiator.parse.type import TypeDefinition
+
+
+@attr.s(auto_attribs=True, kw_only=True, slots=True, frozen=True)
+class IndexedEnumValue:
+    """An enum value and the groups it was declared in."""
+
+    position: int  #: document order
+    name: str
+    value: str
+    type_: Optional[str]
+    groups: Sequence[str]
+
+
+@attr.s(auto_attribs=True, kw_only=True, slots=True, frozen=True)
+class IndexedCommand:
+    """A command definition and its position in the spec. The definition is
+    either its node or its cached representation and is parsed on demand.
+    """
+
+    position: int  #: document order
+    definition: Union[xml.Element, "EncodedCommand"]
+
+
+ExtensionChange = Tuple[Optional[str], str, str]  #: (api, enum|command, name)
+
+
+@attr.s(auto_attribs=True, kw_only=True, slots=True, frozen=True)
+class IndexedExtension:
+    """The supported APIs and requirements of an extension, resolved for a
+    specific API on demand.
+    """
+
+    name: str
+    supported: str  #: e.g. gl|glcore|gles2
+    changes: Sequence[ExtensionChange]
+
+
+@attr.s(auto_attribs=True, kw_only=True, slots=True, frozen=True)
+class SpecIndex:
+    """All definitions of the spec, keyed by the names they are looked up with."""
+
+    types: Sequence["TypeDefinition"]
+    enums: Mapping[str, Sequence[IndexedEnumValue]]
+    bitmask_groups: Mapping[str, bool]
+    commands: Mapping[str, IndexedCommand]
+    features: Mapping["Feature", Sequence["FeatureChange"]]
+    extensions: Mapping[str, IndexedExtension]
+    # NOTE: filled on first use by gladiator.parse.feature.get_feature_timeline
+    timelines: Dict["FeatureApi", "FeatureTimeline"] = attr.ib(factory=dict)
@@ -0,0 +1,146 @@
+"""Load and index the sections of the OpenGL spec file required for code generation."""
+
+from collections import defaultdict
+from contextlib import contextmanager
+from itertools import count
+import mmap
+from pathlib import Path
+from typing import Collection, DefaultDict, Dict, Iterator, List, Sequence, Union
+import xml.etree.ElementTree as xml
+
+from gladiator.optional import OptionalValue
+from gladiator.parse.command import _parse_name
+from gladiator.parse.enum import _parse_groups
+from gladiator.parse.extension import parse_extension_changes
+from gladiator.parse.feature import (
+    Feature,
+    FeatureChange,
+    parse_feature_changes,
+    _parse_feature,
+)
+from gladiator.parse.index import (
+    IndexedCommand,
+    IndexedEnumValue,
+    IndexedExtension,
+    SpecIndex,
+)
+from gladiator.parse.type import get_type_definitions
+
+
+REQUIRED_SECTIONS = frozenset(("types", "enums", "commands", "feature", "extensions"))
+
+# NOTE: tags of the immediate children of top-level sections that never appear
+# anywhere else in the registry, so they can be freed while streaming
+_SECTION_ITEMS = {"extensions": "extension", "groups": "group", "kinds": "kind"}
+
+
+@contextmanager
+def _open_spec(spec_file: Union[str, Path], memory_map: bool):
+    with open(spec_file, "rb") as file:
+        if not memory_map:
+            yield file
+            return
+
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            yield mapped
+
+
+def load_spec(
+    spec_file: Union[str, Path],
+    sections: Collection[str] = REQUIRED_SECTIONS,
+    memory_map: bool = False,
+) -> xml.Element:
+    """Stream the given spec file and return its root containing only the given
+    top-level sections. Items of all other sections are discarded as soon as
+    they were read.
+    """
+    discarded = {
+        item for section, item in _SECTION_ITEMS.items() if section not in sections
+    }
+
+    with _open_spec(spec_file, memory_map) as source:
+        events = xml.iterparse(source, events=("end",))
+        for _, node in events:
+            if node.tag in discarded:
+                node.clear()
+        root = events.root
+
+    root[:] = [node for node in root if node.tag in sections]
+    return root
+
+
+def _index_enums(
+    enums_node: xml.Element,
+    positions: Iterator[int],
+    enums: DefaultDict[str, List[IndexedEnumValue]],
+    bitmask_groups: Dict[str, bool],
+):
+    group = enums_node.attrib.get("group")
+    if group:
+        is_bitmask = enums_node.attrib.get("type") == "bitmask"
+        bitmask_groups[group] = bitmask_groups.get(group, False) or is_bitmask
+
+    for value_node in enums_node:
+        if value_node.tag == "enum":
+            name = value_node.attrib["name"]
+            enums[name].append(
+                IndexedEnumValue(
+                    position=next(positions),
+                    name=name,
+                    value=value_node.attrib["value"],
+                    type_=value_node.attrib.get("type"),
+                    groups=tuple(_parse_groups(value_node)),
+                )
+            )
+
+
+def _index_commands(commands_node: xml.Element, commands: Dict[str, IndexedCommand]):
+    for position, node in enumerate(commands_node):
+        name = _parse_name(OptionalValue(node.find("proto")).value)
+        commands[name] = IndexedCommand(position=position, definition=node)
+
+
+def _index_extensions(
+    extensions_node: xml.Element, extensions: Dict[str, IndexedExtension]
+):
+    for node in extensions_node:
+        name = node.attrib["name"]
+        extensions[name] = IndexedExtension(
+            name=name,
+            supported=node.attrib["supported"],
+            changes=parse_extension_changes(node),
+        )
+
+
+def build_spec_index(spec_root: xml.Element) -> SpecIndex:
+    """Index all definitions of the given spec root in a single pass."""
+    types = ()
+    positions = count()
+    enums: DefaultDict[str, List[IndexedEnumValue]] = defaultdict(list)
+    bitmask_groups: Dict[str, bool] = {}
+    commands: Dict[str, IndexedCommand] = {}
+    features: Dict[Feature, Sequence[FeatureChange]] = {}
+    extensions: Dict[str, IndexedExtension] = {}
+
+    for node in spec_root:
+        if node.tag == "types":
+            types = tuple(get_type_definitions(node))
+        elif node.tag == "enums":
+            _index_enums(node, positions, enums, bitmask_groups)
+        elif node.tag == "commands":
+            _index_commands(node, commands)
+        elif node.tag == "feature":
+            feature = _parse_feature(node)
+            if feature:
+                features[feature] = parse_feature_changes(node)
+        elif node.tag == "extensions":
+            _index_extensions(node, extensions)
+
+    return SpecIndex(
+        types=types,
+        enums=dict(enums),
+        bitmask_groups=bitmask_groups,
+        commands=commands,
+        features=features,
+        extensions=extensions,
+    )
@@ -1,10 +1,12 @@
 """Parse OpenGL type definitions. Basically to be copied as-is, since it's C code."""
 
+from typing import Union
 import xml.etree.ElementTree as xml
 
 import attr
 
 from gladiator.optional import OptionalValue
+from gladiator.parse.index import SpecIndex
 
 
 @attr.s(auto_attribs=True, kw_only=True, slots=True, frozen=True)
@@ -27,8 +29,12 @@ def parse_type_definition(node: xml.Element):
     return TypeDefinition(name=_get_name(node), statement="".join(node.itertext()))
 
 
-def get_type_definitions(container_node: xml.Element):
+def get_type_definitions(container_node: Union[xml.Element, SpecIndex]):
     """Parse all OpenGL <type> definitions and yield them."""
+    if isinstance(container_node, SpecIndex):
+        yield from container_node.types
+        return
+
     for node in container_node:
         if (
             node.attrib.get("name", None) != "khrplatform"
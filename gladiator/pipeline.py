@@ -0,0 +1,236 @@
+"""Run all stages from the spec index to the generated code of a target."""
+
+from typing import Dict, Optional, Sequence, TYPE_CHECKING
+
+import attr
+
+from gladiator.parse.enum import parse_required_enums
+from gladiator.parse.command import parse_required_commands
+from gladiator.parse.extension import (
+    Extension,
+    get_extension,
+    get_supported_extension_names,
+)
+from gladiator.parse.feature import Feature
+from gladiator.parse.index import SpecIndex
+from gladiator.parse.type import get_type_definitions, TypeDefinition
+from gladiator.prepare.command import prepare_commands
+from gladiator.prepare.enum import prepare_enums, PreparedEnum
+from gladiator.prepare.extension import prepare_extension_set, PreparedExtensionSet
+from gladiator.prepare.feature import prepare_feature_levels, PreparedFeatureLevel
+from gladiator.options import Options, Scope
+from gladiator.profiling import phase
+from gladiator.tools.compare import get_all_feature_requirements, merge_requirements
+from gladiator.usage import (
+    get_used_commands,
+    make_prune_report,
+    scan_used_symbols,
+    write_prune_report,
+)
+from gladiator.prepare.resource_wrapper import (
+    prepare_resource_wrappers,
+    PreparedResourceWrapper,
+)
+
+if TYPE_CHECKING:
+    import jinja2
+
+
+def _get_required_groups_by_commands(commands):
+    for command in commands:
+        if command.return_type.high_level:
+            yield command.return_type.high_level
+        for param in command.params:
+            if param.type_.high_level:
+                yield param.type_.high_level
+
+
+def _filter_unneeded_groups(enums, commands):
+    # NOTE: <require> nodes name required low-level enum values, but not the
+    # high level types, thus we need to remove unneeded groups that were
+    # included due to re-use of an enum value
+    required = set(_get_required_groups_by_commands(commands))
+    return [e for e in enums if e.name in required]
+
+
+def _intersect_extensions(extensions: Sequence[Extension]):
+    first, others = extensions[0], extensions[1:]
+    return attr.evolve(
+        first,
+        required_enums=[
+            name
+            for name in first.required_enums
+            if all(name in other.required_enums for other in others)
+        ],
+        required_commands=[
+            name
+            for name in first.required_commands
+            if all(name in other.required_commands for other in others)
+        ],
+    )
+
+
+def _get_required_extensions(
+    index: SpecIndex, options: Options, features: Sequence[Feature]
+):
+    for name in options.extensions:
+        resolved = [get_extension(index, name, feature.api) for feature in features]
+        if resolved[0] is None:
+            raise SystemExit(f"ERROR: {name} does not exist in the spec")
+
+        unsupported = [
+            str(feature)
+            for feature, extension in zip(features, resolved)
+            if not extension.is_supported(feature)
+        ]
+        if unsupported:
+            raise SystemExit(
+                f"ERROR: {name} is not supported by {', '.join(unsupported)}"
+            )
+        extension = _intersect_extensions(resolved)
+        # NOTE: e.g. GL ES names the entry points of some extensions with a suffix
+        if not (extension.required_enums or extension.required_commands) and any(
+            e.required_enums or e.required_commands for e in resolved
+        ):
+            apis = ", ".join(str(feature) for feature in features)
+            raise SystemExit(
+                f"ERROR: {name} shares no enums or commands across {apis},"
+                " generate it for each API separately"
+            )
+        yield extension
+
+
+def _prune_unused(commands, enums, options: Options):
+    used = scan_used_symbols(options.prune_unused)
+    kept_commands = tuple(get_used_commands(commands, used, options))
+    kept_enums = _filter_unneeded_groups(enums, kept_commands)
+    report = make_prune_report(
+        options,
+        all_commands=[c.name for c in commands],
+        commands=[c.name for c in kept_commands],
+        all_enums=[e.name for e in enums],
+        enums=[e.name for e in kept_enums],
+    )
+    write_prune_report(report, options)
+    return kept_commands, kept_enums
+
+
+def _parse_definitions(index: SpecIndex, options: Options):
+    with phase("feature requirements"):
+        all_requirements = tuple(
+            get_all_feature_requirements(index, options.api, options.version)
+        )
+        feature, requirements = merge_requirements(all_requirements)
+        extensions = tuple(
+            _get_required_extensions(index, options, [f for f, _ in all_requirements])
+        )
+
+    with phase("parse types"):
+        types = tuple(get_type_definitions(index))
+    with phase("parse commands"):
+        commands = tuple(
+            parse_required_commands(
+                (
+                    *requirements.commands.keys(),
+                    *(c for e in extensions for c in e.required_commands),
+                ),
+                index,
+            )
+        )
+    with phase("parse enums"):
+        enums = _filter_unneeded_groups(
+            parse_required_enums(
+                (
+                    *requirements.enums.keys(),
+                    *(n for e in extensions for n in e.required_enums),
+                ),
+                index,
+            ),
+            commands,
+        )
+    if options.prune_unused:
+        # NOTE: requirements are left as is, so all feature levels are kept
+        with phase("prune unused"):
+            commands, enums = _prune_unused(commands, enums, options)
+    return types, enums, commands, feature, requirements, extensions
+
+
+@attr.s(auto_attribs=True, kw_only=True, slots=True, frozen=True)
+class _ParseResult:
+    types: Sequence[TypeDefinition]
+    enums: Dict[str, PreparedEnum]
+    feature_levels: Sequence[PreparedFeatureLevel]
+    resource_wrappers: Sequence[PreparedResourceWrapper]
+    extension_set: Optional[PreparedExtensionSet]
+
+
+def _parse_spec(index: SpecIndex, options: Options):
+    types, enums, commands, feature, requirements, extensions = _parse_definitions(
+        index, options
+    )
+    with phase("prepare enums"):
+        prepared_enums = dict(prepare_enums(enums, options))
+    with phase("prepare commands"):
+        prepared_commands = dict(prepare_commands(commands, prepared_enums, options))
+    with phase("prepare resource wrappers"):
+        resource_wrappers = tuple(prepare_resource_wrappers(prepared_commands, options))
+    with phase("prepare feature levels"):
+        feature_levels = prepare_feature_levels(
+            feature.api, requirements, prepared_commands, extensions
+        )
+    extension_set = None
+    if options.extension_queries:
+        with phase("prepare extension queries"):
+            features = [
+                Feature(api=api, version=version)
+                for api, version in zip(options.api, options.version)
+            ]
+            extension_set = prepare_extension_set(
+                get_supported_extension_names(index, features)
+            )
+    return _ParseResult(
+        types=types,
+        enums=prepared_enums,
+        resource_wrappers=resource_wrappers,
+        feature_levels=feature_levels,
+        extension_set=extension_set,
+    )
+
+
+def check_preconditions(options: Options):
+    """Reject options that cannot be generated."""
+    if len(options.api) != len(options.version):
+        raise SystemExit("ERROR: Must specify a version for every API")
+    if options.output and options.output_dir:
+        raise SystemExit("ERROR: Must specify either an output or an output dir")
+    if options.depfile and not (options.output or options.output_dir):
+        raise SystemExit("ERROR: Must specify an output to write a depfile for")
+    if options.lazy_load and options.scope != Scope.GLOBAL:
+        raise SystemExit("ERROR: Lazy loading requires global scope")
+    if options.loader_table and options.scope != Scope.GLOBAL:
+        raise SystemExit("ERROR: A loader table requires global scope")
+    if options.loader_table and options.lazy_load:
+        raise SystemExit("ERROR: Must specify either a loader table or lazy loading")
+    if options.prune_report and not options.prune_unused:
+        raise SystemExit("ERROR: Must specify files to prune unused commands by")
+
+
+def generate(
+    index: SpecIndex, options: Options, env: Optional["jinja2.Environment"] = None
+):
+    """Prepare and render the target described by the given options, reusing
+    the given template environment if any.
+    """
+    # NOTE: imports jinja2, which is not needed until rendering
+    from gladiator.generate.code import generate_code
+
+    result = _parse_spec(index, options)
+    generate_code(
+        options,
+        result.types,
+        result.enums.values(),
+        result.feature_levels,
+        result.resource_wrappers,
+        env,
+        result.extension_set,
+    )
@@ -1,16 +1,17 @@
 """Prepare OpenGL commands for use in templates."""
 
 from enum import auto, Enum
+from functools import lru_cache
 from typing import Iterable, Mapping, Optional, Union
 
 import attr
 
 from gladiator.parse.command import Command, Type
 from gladiator.prepare.enum import PreparedEnum
-from gladiator.prepare.style import transform_symbol
+from gladiator.prepare.style import transform_symbols
 from gladiator.optional import OptionalValue
 from gladiator.options import Options
-from gladiator.resources import read_resource_file
+from gladiator.resources import get_resource_table
 
 
 class CommandType(Enum):
@@ -74,13 +75,13 @@ class PreparedCommand:
     implementation: PreparedImplementation
 
 
-_TYPE_TRANSLATIONS = dict(
-    t.split(",") for t in read_resource_file("data/type_translations").split("\n") if t
-)
+@lru_cache(maxsize=None)
+def _get_type_translations():
+    return dict(t.split(",") for t in get_resource_table("type_translations"))
 
 
 def _translate_low_level_type(low_level: str):
-    return _TYPE_TRANSLATIONS.get(low_level, low_level)
+    return _get_type_translations().get(low_level, low_level)
 
 
 def _make_type_reference(target: Type, prepared_enums: Mapping[str, PreparedEnum]):
@@ -137,13 +138,17 @@ def prepare_commands(
     given enums are used to construct type references. Yields tuples mapping the
     original command name to the prepared command.
     """
+    commands = tuple(commands)
+    names = transform_symbols(
+        (command.name for command in commands),
+        options.function_case,
+        options.omit_prefix,
+    )
 
-    for command in commands:
+    for command, name in zip(commands, names):
         yield command.name, PreparedCommand(
             original=command,
             type_=CommandType.DEFAULT,
             implementation=_make_default_implementation(command, prepared_enums),
-            name=transform_symbol(
-                command.name, options.function_case, options.omit_prefix
-            ),
+            name=name,
         )
@@ -1,13 +1,14 @@
 """Prepare OpenGL enums for use in templates."""
 
+from functools import lru_cache
 from typing import Iterable
 
 import attr
 
 from gladiator.parse.enum import Enum
-from gladiator.prepare.style import transform_symbol
+from gladiator.prepare.style import transform_symbol, transform_symbols
 from gladiator.options import Options
-from gladiator.resources import read_resource_file
+from gladiator.resources import get_resource_table
 
 
 @attr.s(auto_attribs=True, kw_only=True, slots=True, frozen=True)
@@ -24,16 +25,14 @@ class PreparedEnum:
     values: Iterable[PreparedEnumValue]
 
 
-_NAME_OVERRIDES = dict(
-    t.split(",")
-    for t in read_resource_file("data/enum_name_overrides").split("\n")
-    if t
-)
+@lru_cache(maxsize=None)
+def _get_name_overrides():
+    return dict(t.split(",") for t in get_resource_table("enum_name_overrides"))
 
 
 def _override(enum: str):
     # NOTE: motivation is symbol conflicts after gl prefix is stripped
-    return _NAME_OVERRIDES.get(enum, enum)
+    return _get_name_overrides().get(enum, enum)
 
 
 def prepare_enums(enums: Iterable[Enum], options: Options):
@@ -41,6 +40,11 @@ def prepare_enums(enums: Iterable[Enum], options: Options):
     mapping the original enum name to the prepared enum.
     """
     for enum in enums:
+        names = transform_symbols(
+            (value.name for value in enum.values),
+            options.enum_value_case,
+            options.omit_prefix,
+        )
         yield enum.name, PreparedEnum(
             original_name=enum.name,
             is_bitmask=enum.is_bitmask,
@@ -48,12 +52,7 @@ def prepare_enums(enums: Iterable[Enum], options: Options):
                 _override(enum.name), options.enum_case, options.omit_prefix
             ),
             values=[
-                PreparedEnumValue(
-                    value=value.value,
-                    name=transform_symbol(
-                        value.name, options.enum_value_case, options.omit_prefix
-                    ),
-                )
-                for value in enum.values
+                PreparedEnumValue(value=value.value, name=name)
+                for value, name in zip(enum.values, names)
             ],
         )
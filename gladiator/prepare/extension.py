@@ -0,0 +1,84 @@
+"""Prepare runtime queries of supported extensions for use in templates."""
+
+from itertools import count
+from typing import Dict, List, Sequence
+
+import attr
+
+_FNV_OFFSET_BASIS = 2166136261
+_FNV_PRIME = 16777619
+_KEYS_PER_BUCKET = 4
+
+
+@attr.s(auto_attribs=True, kw_only=True, slots=True, frozen=True)
+class PreparedExtensionSet:
+    """Extensions by id and a perfect hash mapping their names to their ids:
+    the seed of the bucket a name hashes to (with seed 0) selects its slot.
+    """
+
+    names: Sequence[str]
+    identifiers: Sequence[str]  #: enumerators of the ids, without GL_ if possible
+    seeds: Sequence[int]  #: per bucket
+    slots: Sequence[int]  #: id per slot, the number of names if empty
+
+
+def hash_name(name: str, seed: int) -> int:
+    """Hash the given name with 32-bit FNV-1a, starting from the seeded basis."""
+    value = _FNV_OFFSET_BASIS ^ seed
+    for byte in name.encode("ascii"):
+        value = ((value ^ byte) * _FNV_PRIME) & 0xFFFFFFFF
+    return value
+
+
+def _next_power_of_two(value: int):
+    return 1 << max(0, value - 1).bit_length()
+
+
+def _make_identifier(name: str):
+    stripped = name.removeprefix("GL_")
+    return name if stripped[:1].isdigit() else stripped
+
+
+def _place_buckets(buckets: List[List[int]], names: Sequence[str], size: int):
+    # NOTE: hash and displace, placing the largest buckets first while most
+    # slots are free
+    slots = [len(names)] * size
+    seeds = [0] * len(buckets)
+    for bucket in sorted(range(len(buckets)), key=lambda b: -len(buckets[b])):
+        ids = buckets[bucket]
+        if not ids:
+            continue
+        for seed in count(1):
+            positions = {hash_name(names[i], seed) & (size - 1) for i in ids}
+            if len(positions) == len(ids) and all(
+                slots[p] == len(names) for p in positions
+            ):
+                break
+        seeds[bucket] = seed
+        for i in ids:
+            slots[hash_name(names[i], seed) & (size - 1)] = i
+    return seeds, slots
+
+
+def prepare_extension_set(names: Sequence[str]) -> PreparedExtensionSet:
+    """Assign ids to the given extension names and build a perfect hash over
+    them, so names are looked up with a single probe.
+    """
+    names = tuple(names)
+    bucket_count = _next_power_of_two(-(-len(names) // _KEYS_PER_BUCKET))
+    buckets: Dict[int, List[int]] = {b: [] for b in range(bucket_count)}
+    for position, name in enumerate(names):
+        buckets[hash_name(name, 0) & (bucket_count - 1)].append(position)
+
+    # NOTE: at most half of the slots are used, so few seeds need to be tried
+    seeds, slots = _place_buckets(
+        [buckets[b] for b in range(bucket_count)],
+        names,
+        _next_power_of_two(2 * len(names)),
+    )
+    return PreparedExtensionSet(
+        names=names,
+        identifiers=tuple(_make_identifier(name) for name in names),
+        seeds=tuple(seeds),
+        slots=tuple(slots),
+    )
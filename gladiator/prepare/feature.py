@@ -1,10 +1,12 @@
 """Prepare OpenGL features for use in templates."""
 
 from collections import defaultdict
-from typing import DefaultDict, Iterable, List, Mapping
+from itertools import accumulate
+from typing import DefaultDict, Iterable, List, Mapping, Optional, Sequence
 
 import attr
 
+from gladiator.parse.extension import Extension
 from gladiator.parse.feature import Feature, FeatureApi, FeatureVersion, Requirements
 from gladiator.prepare.command import PreparedCommand
 
@@ -15,6 +17,8 @@ class PreparedFeatureLevel:
     version: FeatureVersion
     commands: Iterable[PreparedCommand]
     is_merged: bool
+    extension: Optional[str] = None  #: name of the loaded extension, if any
+    table_offset: int = 0  #: index of the first command in the loader table
 
     def __lt__(self, other):
         if isinstance(other, PreparedFeatureLevel):
@@ -33,8 +37,10 @@ def _determine_levels(
 ):
     levels: DefaultDict[Feature, List[PreparedCommand]] = defaultdict(list)
     for command, version in requirements.commands.items():
-        feature = Feature(api=api, version=version)
-        levels[feature].append(prepared_commands[command])
+        # NOTE: levels of pruned commands are kept, so their loaders still exist
+        level = levels[Feature(api=api, version=version)]
+        if command in prepared_commands:
+            level.append(prepared_commands[command])
     return levels
 
 
@@ -48,21 +54,47 @@ def _prepare_levels(levels: Mapping[Feature, List[PreparedCommand]]):
         )
 
 
-def prepare_feature_levels(
+def _prepare_extension_levels(
     api: FeatureApi,
     requirements: Requirements,
     prepared_commands: Mapping[str, PreparedCommand],
-) -> List[PreparedFeatureLevel]:
-    """Assign commands to the features that first introduced them and link them
-    to already prepared commands.
-    """
+    extensions: Iterable[Extension],
+):
+    # NOTE: commands of the feature levels or of previous extensions are
+    # already loaded there
+    loaded = set(requirements.commands)
+    for extension in extensions:
+        commands = [
+            prepared_commands[command]
+            for command in extension.required_commands
+            if command not in loaded and command in prepared_commands
+        ]
+        loaded.update(extension.required_commands)
+        yield PreparedFeatureLevel(
+            api=api,
+            version=FeatureVersion(major=0, minor=0),
+            commands=commands,
+            is_merged=False,
+            extension=extension.name,
+        )
+
+
+def _prepare_core_levels(
+    api: FeatureApi,
+    requirements: Requirements,
+    prepared_commands: Mapping[str, PreparedCommand],
+):
     # we don't distinct between feature levels when multiple APIs were intersected
     if requirements.is_merged:
         return [
             PreparedFeatureLevel(
                 api=api,
                 version=FeatureVersion(major=0, minor=0),
-                commands=prepared_commands.values(),
+                commands=[
+                    command
+                    for name, command in prepared_commands.items()
+                    if name in requirements.commands
+                ],
                 is_merged=True,
             )
         ]
@@ -70,3 +102,36 @@ def prepare_feature_levels(
     return sorted(
         _prepare_levels(_determine_levels(api, requirements, prepared_commands))
     )
+
+
+def prepare_feature_levels(
+    api: FeatureApi,
+    requirements: Requirements,
+    prepared_commands: Mapping[str, PreparedCommand],
+    extensions: Iterable[Extension] = (),
+) -> List[PreparedFeatureLevel]:
+    """Assign commands to the features that first introduced them and link them
+    to already prepared commands. Each extension gets a level of its own after
+    the feature levels, loading only the commands no other level loads. Levels
+    are assigned consecutive ranges of the loader table in order.
+    """
+    levels = [
+        *_prepare_core_levels(api, requirements, prepared_commands),
+        *_prepare_extension_levels(api, requirements, prepared_commands, extensions),
+    ]
+    # NOTE: levels get consecutive ranges of the table, so each is loaded in one loop
+    offsets = accumulate((len(level.commands) for level in levels), initial=0)
+    return [attr.evolve(level, table_offset=o) for level, o in zip(levels, offsets)]
+
+
+def link_levels(levels: Sequence[PreparedFeatureLevel]):
+    """Pair each level with the level it builds upon, if any, and whether it is
+    the first level. Extension levels are loaded on their own.
+    """
+    previous = None
+    for position, level in enumerate(levels):
+        if level.extension:
+            yield level, None, False
+        else:
+            yield level, previous, position == 0
+            previous = level
@@ -1,6 +1,7 @@
 """Prepare scoped resource wrappers for use in templates."""
 
 from enum import auto, Enum
+from functools import lru_cache
 from typing import Iterable, Mapping, Union
 
 import attr
@@ -8,7 +9,7 @@ import attr
 from gladiator.options import Options
 from gladiator.prepare.command import PreparedCommand, TypeReference
 from gladiator.prepare.style import transform_symbol
-from gladiator.resources import read_resource_file
+from gladiator.resources import get_resource_table
 
 
 class ResourceWrapperType(Enum):
@@ -24,11 +25,14 @@ class _MultiWrapper:
         self.plural_name = plural_name
 
     def style(self, options: Options):
-        self.singular_name = transform_symbol(
-            self.singular_name, options.enum_case, True
+        # NOTE: a new wrapper, the unstyled ones are shared by all generations
+        # of a batch or server process
+        return _MultiWrapper(
+            self.create,
+            self.delete,
+            transform_symbol(self.singular_name, options.enum_case, True),
+            transform_symbol(self.plural_name, options.enum_case, True),
         )
-        self.plural_name = transform_symbol(self.plural_name, options.enum_case, True)
-        return self
 
 
 class _SingleWrapper:
@@ -38,8 +42,11 @@ class _SingleWrapper:
         self.name = name
 
     def style(self, options: Options):
-        self.name = transform_symbol(self.name, options.enum_case, True)
-        return self
+        return _SingleWrapper(
+            self.create,
+            self.delete,
+            transform_symbol(self.name, options.enum_case, True),
+        )
 
 
 @attr.s(auto_attribs=True, kw_only=True, slots=True, frozen=True)
@@ -51,25 +58,27 @@ class PreparedResourceWrapper:
     underlying: Union[_MultiWrapper, _SingleWrapper]
 
 
-_MULTI_RESOURCE_WRAPPERS = [
-    _MultiWrapper(*w.split(","))
-    for w in read_resource_file("data/scoped_resources_multi").split("\n")
-    if w
-]
+@lru_cache(maxsize=None)
+def _get_multi_resource_wrappers():
+    return tuple(
+        _MultiWrapper(*w.split(","))
+        for w in get_resource_table("scoped_resources_multi")
+    )
 
 
-_SINGLE_RESOURCE_WRAPPERS = [
-    _SingleWrapper(*w.split(","))
-    for w in read_resource_file("data/scoped_resources_single").split("\n")
-    if w
-]
+@lru_cache(maxsize=None)
+def _get_single_resource_wrappers():
+    return tuple(
+        _SingleWrapper(*w.split(","))
+        for w in get_resource_table("scoped_resources_single")
+    )
 
 
 def prepare_resource_wrappers(
     commands: Mapping[str, PreparedCommand], options: Options
 ):
     """Prepare scoped resource wrappers for OpenGL objects."""
-    for wrapper in _MULTI_RESOURCE_WRAPPERS:
+    for wrapper in _get_multi_resource_wrappers():
         if wrapper.create in commands and wrapper.delete in commands:
             yield PreparedResourceWrapper(
                 type_=ResourceWrapperType.MULTI,
@@ -82,7 +91,7 @@ def prepare_resource_wrappers(
                 ],
             )
 
-    for wrapper in _SINGLE_RESOURCE_WRAPPERS:
+    for wrapper in _get_single_resource_wrappers():
         if wrapper.create in commands and wrapper.delete in commands:
             yield PreparedResourceWrapper(
                 type_=ResourceWrapperType.SINGLE,
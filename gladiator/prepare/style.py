@@ -1,35 +1,26 @@
 """Transform function and enum names according to the preferred style options."""
 
-from typing import Sequence
+from functools import lru_cache
+import re
+from typing import Iterable, List, Sequence, Tuple
 
 from gladiator.options import Case
-from gladiator.resources import read_resource_file
+from gladiator.resources import get_resource_table
 
 
-_RESERVED_KEYWORDS = [
-    t for t in read_resource_file("data/cpp_keywords").split("\n") if t
-]
+@lru_cache(maxsize=None)
+def _get_reserved_keywords():
+    return frozenset(get_resource_table("cpp_keywords"))
 
 
-def _get_word_boundaries(symbol: str):
-    b_start = 0
-    was_lower = False
+# NOTE: words end at underscores, which are dropped, and before an upper case
+# letter that follows a lower case one
+_WORD_BOUNDARY_PATTERN = re.compile("_|(?<=[a-z])(?=[A-Z])")
 
-    for index, char in enumerate(symbol):
-        if was_lower and char.isupper():
-            yield b_start, index
-            b_start = index
-        elif char == "_":
-            yield b_start, index
-            b_start = index + 1
-        was_lower = char.islower()
 
-    yield b_start, len(symbol)
-
-
-def _split_into_words(symbol: str):
-    for start, end in _get_word_boundaries(symbol):
-        yield symbol[start:end]
+@lru_cache(maxsize=None)
+def _split_into_words(symbol: str) -> Tuple[str, ...]:
+    return tuple(_WORD_BOUNDARY_PATTERN.split(symbol))
 
 
 def _omit_gl_str(symbol: str):
@@ -51,24 +42,27 @@ def _camel_case(words: Sequence[str]):
         yield word.capitalize()
 
 
-def _apply_case(words: Sequence[str], case: Case):
-    if case == Case.SNAKE_CASE:
-        return "_".join(w.lower() for w in words)
-    if case == Case.UPPER_CASE:
-        return "_".join(w.upper() for w in words)
-    if case == Case.PASCAL_CASE:
-        return "".join(w.capitalize() for w in words)
-    if case == Case.CAMEL_CASE:
-        return "".join(_camel_case(words))
-    return "".join(words)
+_CASE_TRANSFORMS = {
+    Case.SNAKE_CASE: lambda words: "_".join(words).lower(),
+    Case.UPPER_CASE: lambda words: "_".join(words).upper(),
+    Case.PASCAL_CASE: lambda words: "".join(w.capitalize() for w in words),
+    Case.CAMEL_CASE: lambda words: "".join(_camel_case(words)),
+}
 
 
 def _resolve_conflicts(symbol: str):
-    while symbol in _RESERVED_KEYWORDS:
+    reserved = _get_reserved_keywords()
+    while symbol in reserved:
         symbol = f"{symbol}_"
     return symbol
 
 
+@lru_cache(maxsize=None)
+def _transform_words(symbol: str, case: Case, omit_gl: bool):
+    words = _omit_gl(_split_into_words(symbol), omit_gl)
+    return _resolve_conflicts(_CASE_TRANSFORMS[case](words))
+
+
 def transform_symbol(symbol: str, case: Case, omit_gl: bool):
     """Transform the given symbol according to the provided style options."""
     if not symbol:
@@ -76,7 +70,19 @@ def transform_symbol(symbol: str, case: Case, omit_gl: bool):
 
     if case == Case.INITIAL:
         return _omit_gl_str(symbol) if omit_gl else symbol
+    return _transform_words(symbol, case, omit_gl)
+
+
+def clear_caches():
+    """Forget all transformed symbols, e.g. to measure transforming them."""
+    _transform_words.cache_clear()
+    _split_into_words.cache_clear()
+
 
-    return _resolve_conflicts(
-        _apply_case(_omit_gl(tuple(_split_into_words(symbol)), omit_gl), case)
-    )
+def transform_symbols(symbols: Iterable[str], case: Case, omit_gl: bool) -> List[str]:
+    """Transform all given symbols according to the provided style options,
+    each distinct symbol only once.
+    """
+    symbols = tuple(symbols)
+    transformed = {s: transform_symbol(s, case, omit_gl) for s in set(symbols)}
+    return [transformed[s] for s in symbols]
@@ -0,0 +1,153 @@
+"""Measure wall time and peak memory of the phases of a generation run."""
+
+from contextlib import contextmanager
+import json
+from pathlib import Path
+import sys
+import time
+import tracemalloc
+from typing import Dict, Iterator, List, Optional, TYPE_CHECKING
+
+import attr
+
+if TYPE_CHECKING:
+    from gladiator.options import Options
+
+
+@attr.s(auto_attribs=True, kw_only=True, slots=True)
+class PhaseStats:
+    """Totals of all runs of a phase."""
+
+    name: str
+    calls: int = 0
+    seconds: float = 0.0  #: excluding nested phases
+    peak_memory: int = 0  #: bytes traced at most while running
+
+
+@attr.s(auto_attribs=True, kw_only=True, slots=True)
+class _RunningPhase:
+    stats: PhaseStats
+    start: float
+    nested_seconds: float = 0.0
+    peak_memory: int = 0
+
+
+class Profiler:
+    """Collect stats of possibly nested and repeated phases."""
+
+    def __init__(self):
+        self.phases: Dict[str, PhaseStats] = {}
+        self.total_seconds = 0.0
+        self._running: List[_RunningPhase] = []
+
+    def _traced_peak(self):
+        peak = tracemalloc.get_traced_memory()[1] if tracemalloc.is_tracing() else 0
+        if tracemalloc.is_tracing():
+            tracemalloc.reset_peak()
+        return peak
+
+    @contextmanager
+    def phase(self, name: str):
+        """Measure the code run within as the given phase."""
+        if self._running:
+            parent = self._running[-1]
+            parent.peak_memory = max(parent.peak_memory, self._traced_peak())
+        else:
+            self._traced_peak()
+
+        stats = self.phases.setdefault(name, PhaseStats(name=name))
+        running = _RunningPhase(stats=stats, start=time.perf_counter())
+        self._running.append(running)
+        try:
+            yield
+        finally:
+            self._running.pop()
+            elapsed = time.perf_counter() - running.start
+            peak_memory = max(running.peak_memory, self._traced_peak())
+
+            stats.calls += 1
+            stats.seconds += elapsed - running.nested_seconds
+            stats.peak_memory = max(stats.peak_memory, peak_memory)
+            if self._running:
+                parent = self._running[-1]
+                parent.nested_seconds += elapsed
+                parent.peak_memory = max(parent.peak_memory, peak_memory)
+
+    def to_json(self):
+        """Make a machine-readable report."""
+        return {
+            "total_seconds": self.total_seconds,
+            "phases": [attr.asdict(stats) for stats in self.phases.values()],
+        }
+
+    def format_table(self):
+        """Format a summary table of all phases in the order they first ran."""
+        lines = [
+            f"{'phase':<28}{'calls':>7}{'time [ms]':>12}{'share':>8}{'peak [MiB]':>12}"
+        ]
+        total = self.total_seconds or 1.0
+        for stats in self.phases.values():
+            lines.append(
+                f"{stats.name:<28}{stats.calls:>7}{stats.seconds * 1000:>12.1f}"
+                f"{stats.seconds / total:>8.1%}{stats.peak_memory / (1 << 20):>12.2f}"
+            )
+        other = self.total_seconds - sum(s.seconds for s in self.phases.values())
+        lines.append(f"{'other':<28}{'':>7}{other * 1000:>12.1f}{other / total:>8.1%}")
+        lines.append(f"{'total':<28}{'':>7}{self.total_seconds * 1000:>12.1f}")
+        return "\n".join(lines)
+
+
+_ACTIVE: Optional[Profiler] = None
+
+
+@contextmanager
+def phase(name: str):
+    """Measure the code run within as the given phase if profiling."""
+    if _ACTIVE is None:
+        yield
+    else:
+        with _ACTIVE.phase(name):
+            yield
+
+
+def is_profiling_requested(options: "Options"):
+    """Determine whether the given options request any profiling output."""
+    return bool(options.profile or options.profile_json or options.profile_stats)
+
+
+@contextmanager
+def profile_run(options: "Options") -> Iterator[Optional[Profiler]]:
+    """Profile the phases run within if requested by the given options and
+    report the results afterwards. Tracing memory slows down the run.
+    """
+    global _ACTIVE
+    if not is_profiling_requested(options):
+        yield None
+        return
+
+    import cProfile  # NOTE: only needed when profiling
+
+    profiler = Profiler()
+    stats = cProfile.Profile() if options.profile_stats else None
+    tracemalloc.start()
+    _ACTIVE = profiler
+    start = time.perf_counter()
+    if stats:
+        stats.enable()
+    try:
+        yield profiler
+    finally:
+        if stats:
+            stats.disable()
+        profiler.total_seconds = time.perf_counter() - start
+        _ACTIVE = None
+        tracemalloc.stop()
+
+    if options.profile:
+        print(profiler.format_table(), file=sys.stderr)
+    if options.profile_json:
+        Path(options.profile_json).write_text(
+            json.dumps(profiler.to_json(), indent=2) + "\n", encoding="utf-8"
+        )
+    if stats:
+        stats.dump_stats(str(options.profile_stats))
@@ -1,8 +1,31 @@
+from functools import lru_cache
 from pathlib import Path
+from typing import Dict, List, Tuple
 
 BASE_RESOURCE_PATH = Path(__file__).parent
 
+_TABLES_FILE = "data/tables"
+
 
 def read_resource_file(file: str):
     """Read an entire resource file as utf-8."""
     return (BASE_RESOURCE_PATH / file).read_text(encoding="utf-8")
+
+
+@lru_cache(maxsize=None)
+def _read_tables() -> Dict[str, Tuple[str, ...]]:
+    tables: Dict[str, List[str]] = {}
+    rows: List[str] = []
+    for line in read_resource_file(_TABLES_FILE).split("\n"):
+        if line.startswith("[") and line.endswith("]"):
+            rows = tables.setdefault(line[1:-1], [])
+        elif line and not line.startswith("#"):
+            rows.append(line)
+    return {name: tuple(rows) for name, rows in tables.items()}
+
+
+def get_resource_table(name: str) -> Tuple[str, ...]:
+    """Get the rows of the given table of the shipped data. All tables are read
+    on first use.
+    """
+    return _read_tables()[name]
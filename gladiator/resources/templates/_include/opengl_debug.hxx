@@ -1,10 +1,15 @@
-#ifndef _NDEBUG
+{% include "_include/opengl_debug_declaration.hxx" %}
 
+#ifndef NDEBUG
+
+#include <atomic>
+#include <cstddef>
 #include <cstdint>
+#include <cstdio>
 #include <cstdlib>
 #include <type_traits>
-#include <iostream>
-#include <string>
+
+{% set namespace = options.loader_or_class_namespace or constants.default_namespace %}
 
 namespace {{ constants.detail_namespace }} {
 
@@ -14,26 +19,80 @@ constexpr std::uint32_t GL_DEBUG_OUTPUT = 0x92E0;
 constexpr std::uint32_t GL_DEBUG_OUTPUT_SYNCHRONOUS = 0x8242;
 constexpr std::uint32_t GL_DONT_CARE = 0x1100;
 constexpr std::uint32_t GL_DEBUG_TYPE_ERROR = 0x824C;
-constexpr std::uint32_t GL_DEBUG_SEVERITY_LOW = 0x9146;
+constexpr std::uint32_t GL_DEBUG_TYPE_DEPRECATED_BEHAVIOR = 0x824D;
+constexpr std::uint32_t GL_DEBUG_TYPE_UNDEFINED_BEHAVIOR = 0x824E;
+constexpr std::uint32_t GL_DEBUG_TYPE_PORTABILITY = 0x824F;
+constexpr std::uint32_t GL_DEBUG_TYPE_PERFORMANCE = 0x8250;
+constexpr std::uint32_t GL_DEBUG_TYPE_OTHER = 0x8251;
+constexpr std::uint32_t GL_DEBUG_TYPE_MARKER = 0x8268;
+constexpr std::uint32_t GL_DEBUG_TYPE_PUSH_GROUP = 0x8269;
+constexpr std::uint32_t GL_DEBUG_TYPE_POP_GROUP = 0x826A;
+constexpr std::uint32_t GL_DEBUG_SEVERITY_HIGH = 0x9146;
 constexpr std::uint32_t GL_DEBUG_SEVERITY_MEDIUM = 0x9147;
-constexpr std::uint32_t GL_DEBUG_SEVERITY_HIGH = 0x9148;
+constexpr std::uint32_t GL_DEBUG_SEVERITY_LOW = 0x9148;
+constexpr std::uint32_t GL_DEBUG_SEVERITY_NOTIFICATION = 0x826B;
+constexpr std::uint32_t GL_FALSE = 0;
 constexpr std::uint32_t GL_TRUE = 1;
 
-void _debug_output(std::uint32_t,
+constexpr std::uint32_t _debug_capacity = 128;
+
+{# NOTE: sequences are stored relative to the index of their slot, so the ring is zero initialized without any guards #}
+struct _debug_slot {
+	std::atomic<std::uint32_t> turn;
+	{{ namespace }}::debug_message message;
+};
+
+{# NOTE: bounded queue of multiple producers and consumers, the driver may report from several threads #}
+struct _debug_ring {
+	_debug_slot slots[_debug_capacity];
+	alignas(64) std::atomic<std::uint32_t> head;
+	alignas(64) std::atomic<std::uint32_t> tail;
+	std::atomic<std::uint32_t> dropped;
+};
+
+_debug_ring _debug_messages;
+
+void _debug_output(std::uint32_t source,
 		std::uint32_t type,
-		std::uint32_t,
+		std::uint32_t id,
 		std::uint32_t severity,
 		std::int32_t,
 		const char* msg,
 		const void*)
 {
-	if (severity == GL_DEBUG_SEVERITY_LOW || severity == GL_DEBUG_SEVERITY_MEDIUM || severity == GL_DEBUG_SEVERITY_HIGH) {
-		std::cout << msg << std::endl;
-		if (type == GL_DEBUG_TYPE_ERROR) {
-			std::cout << "programming error found, aborting" << std::endl;
-			std::abort();
+	if (type == GL_DEBUG_TYPE_ERROR) {
+		std::fputs(msg, stderr);
+		std::fputs("\nprogramming error found, aborting\n", stderr);
+		std::abort();
+	}
+
+	auto pos = _debug_messages.head.load(std::memory_order_relaxed);
+	for (;;) {
+		const auto index = pos % _debug_capacity;
+		const auto turn = _debug_messages.slots[index].turn.load(std::memory_order_acquire);
+		const auto diff = static_cast<std::int32_t>(turn + index - pos);
+		if (diff == 0) {
+			if (_debug_messages.head.compare_exchange_weak(pos, pos + 1, std::memory_order_relaxed)) break;
+		} else if (diff < 0) {
+			_debug_messages.dropped.fetch_add(1, std::memory_order_relaxed);
+			return;
+		} else {
+			pos = _debug_messages.head.load(std::memory_order_relaxed);
 		}
 	}
+
+	const auto index = pos % _debug_capacity;
+	auto& message = _debug_messages.slots[index].message;
+	message.source = source;
+	message.type = type;
+	message.id = id;
+	message.severity = severity;
+	std::size_t length = 0;
+	for (; length + 1 < sizeof(message.text) && msg[length] != '\0'; ++length) {
+		message.text[length] = msg[length];
+	}
+	message.text[length] = '\0';
+	_debug_messages.slots[index].turn.store(pos + 1 - index, std::memory_order_release);
 }
 
 using _proc_address_func = std::add_pointer<void*(const char*)>::type;
@@ -49,14 +108,22 @@ void* _core_or_ext(const char* name, _proc_address_func load) {
 		return func;
 	}
 
-	const auto arb = std::string{name} + "ARB";
-	func = load(arb.data());
-	if (func != nullptr) {
-		return func;
+	char suffixed[64] = {};
+	std::size_t length = 0;
+	for (; length + 4 < sizeof(suffixed) && name[length] != '\0'; ++length) {
+		suffixed[length] = name[length];
 	}
-
-	const auto khr = std::string{name} + "KHR";
-  return load(khr.data());
+	static const char* const suffixes[] = {"ARB", "KHR"};
+	for (const auto suffix : suffixes) {
+		for (std::size_t i = 0; i < 4; ++i) {
+			suffixed[length + i] = suffix[i];
+		}
+		func = load(suffixed);
+		if (func != nullptr) {
+			return func;
+		}
+	}
+	return nullptr;
 }
 
 void setup_debug_output(_proc_address_func load) {
@@ -73,12 +140,52 @@ void setup_debug_output(_proc_address_func load) {
 	glGetIntegerv(GL_CONTEXT_FLAGS, &flags);
 	if (flags & GL_CONTEXT_FLAG_DEBUG_BIT) {
 		glEnable(GL_DEBUG_OUTPUT);
+	{% if options.debug_output == DebugOutput.SYNCHRONOUS %}
 		glEnable(GL_DEBUG_OUTPUT_SYNCHRONOUS);
+	{% endif %}
 		glDebugMessageCallback(_debug_output, nullptr);
-		glDebugMessageControl(GL_DONT_CARE, GL_DONT_CARE, GL_DONT_CARE, 0, nullptr, GL_TRUE);
+		{# NOTE: filtered by the driver, so messages that are not reported do not even reach the callback #}
+		glDebugMessageControl(GL_DONT_CARE, GL_DONT_CARE, GL_DONT_CARE, 0, nullptr, GL_FALSE);
+	{% for severity in options.debug_severities %}
+		{% for type in options.debug_types or [none] %}
+		glDebugMessageControl(GL_DONT_CARE, {{ "GL_DEBUG_TYPE_" + type.name if type else "GL_DONT_CARE" }}, GL_DEBUG_SEVERITY_{{ severity.name }}, 0, nullptr, GL_TRUE);
+		{% endfor %}
+	{% endfor %}
 	}
 }
 
 }
 
+namespace {{ namespace }} {
+
+bool poll_debug_message(debug_message& message) noexcept {
+	auto& ring = {{ constants.detail_namespace }}::_debug_messages;
+	constexpr auto capacity = {{ constants.detail_namespace }}::_debug_capacity;
+
+	auto pos = ring.tail.load(std::memory_order_relaxed);
+	for (;;) {
+		const auto index = pos % capacity;
+		const auto turn = ring.slots[index].turn.load(std::memory_order_acquire);
+		const auto diff = static_cast<std::int32_t>(turn + index - (pos + 1));
+		if (diff == 0) {
+			if (ring.tail.compare_exchange_weak(pos, pos + 1, std::memory_order_relaxed)) break;
+		} else if (diff < 0) {
+			return false;
+		} else {
+			pos = ring.tail.load(std::memory_order_relaxed);
+		}
+	}
+
+	const auto index = pos % capacity;
+	message = ring.slots[index].message;
+	ring.slots[index].turn.store(pos + capacity - index, std::memory_order_release);
+	return true;
+}
+
+std::uint32_t dropped_debug_messages() noexcept {
+	return {{ constants.detail_namespace }}::_debug_messages.dropped.load(std::memory_order_relaxed);
+}
+
+}
+
 #endif
@@ -0,0 +1,34 @@
+#ifndef NDEBUG
+#ifndef _GLADIATOR__{{ api_version_id }}__DEBUG_OUTPUT
+#define _GLADIATOR__{{ api_version_id }}__DEBUG_OUTPUT
+
+#include <cstdint>
+#include <type_traits>
+
+namespace {{ constants.detail_namespace }} {
+
+void setup_debug_output(std::add_pointer<void*(const char*)>::type load);
+
+}
+
+namespace {{ options.loader_or_class_namespace or constants.default_namespace }} {
+
+/** debug message reported by the driver, its text is truncated to fit */
+struct debug_message {
+	std::uint32_t source;
+	std::uint32_t type;
+	std::uint32_t id;
+	std::uint32_t severity;
+	char text[256];
+};
+
+/** take the oldest buffered debug message, returns false if there is none */
+bool poll_debug_message(debug_message& message) noexcept;
+
+/** number of debug messages dropped since the buffer was full */
+std::uint32_t dropped_debug_messages() noexcept;
+
+}
+
+#endif
+#endif
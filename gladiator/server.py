@@ -0,0 +1,203 @@
+"""Serve generation requests over a Unix domain socket, keeping parsed spec files
+and compiled templates in memory across requests.
+"""
+
+from argparse import ArgumentParser
+from contextlib import redirect_stderr, redirect_stdout
+import io
+import json
+import os
+from pathlib import Path
+import socket
+import socketserver
+import sys
+import threading
+import traceback
+from types import CodeType
+from typing import Dict, Optional, Sequence, Tuple
+
+import jinja2
+from jinja2.bccache import Bucket
+
+from gladiator.cache import get_cache_dir, load_index
+from gladiator.client import get_default_socket_path
+from gladiator.generate.templates import (
+    make_loader_environment,
+    TemplateBytecodeCache,
+)
+from gladiator.options import make_argument_parser, Options
+from gladiator.parse.index import SpecIndex
+from gladiator.pipeline import check_preconditions, generate
+
+
+def _get_signature(path: Path):
+    stat = path.stat()
+    return stat.st_mtime_ns, stat.st_size
+
+
+class _MemoryBytecodeCache(TemplateBytecodeCache):
+    """Keep compiled templates in memory, keyed by name and content like the
+    cache dir, so environments of later requests skip loading them.
+    """
+
+    def __init__(self, cache_dir: Optional[Path]):
+        super().__init__(cache_dir)
+        self.compiled: Dict[str, CodeType] = {}
+
+    def load_bytecode(self, bucket: Bucket):
+        code = self.compiled.get(bucket.key)
+        if code is not None:
+            bucket.code = code
+            return
+
+        super().load_bytecode(bucket)
+        if bucket.code is not None:
+            self.compiled[bucket.key] = bucket.code
+
+    def dump_bytecode(self, bucket: Bucket):
+        self.compiled[bucket.key] = bucket.code
+        super().dump_bytecode(bucket)
+
+
+class _State:
+    """Parsed spec files and compiled templates shared by all requests."""
+
+    def __init__(self):
+        self.parser = make_argument_parser()
+        self.indexes: Dict[Path, Tuple[Tuple[int, int], SpecIndex]] = {}
+        self.bytecode_caches: Dict[Optional[Path], _MemoryBytecodeCache] = {}
+
+    def get_index(self, options: Options) -> SpecIndex:
+        path = Path(options.spec_file).resolve()
+        signature = _get_signature(path)
+        cached = self.indexes.get(path)
+        if cached is None or cached[0] != signature:
+            index = load_index(
+                path, get_cache_dir(options), memory_map=options.memory_map
+            )
+            cached = self.indexes[path] = (signature, index)
+        return cached[1]
+
+    def get_environment(self, options: Options) -> jinja2.Environment:
+        # NOTE: a new environment per request, since imported macro modules
+        # keep the globals of the first render; only compiled templates are
+        # shared, which are keyed by content and thus pick up changed overrides
+        cache_dir = get_cache_dir(options)
+        if cache_dir not in self.bytecode_caches:
+            self.bytecode_caches[cache_dir] = _MemoryBytecodeCache(cache_dir)
+        overrides = options.template_overrides_dir
+        return make_loader_environment(
+            Path(overrides).resolve() if overrides else None,
+            bytecode_cache=self.bytecode_caches[cache_dir],
+        )
+
+    def run(self, args: Sequence[str]) -> int:
+        options = Options(**(self.parser.parse_args(list(args)).__dict__))
+        check_preconditions(options)
+        generate(self.get_index(options), options, self.get_environment(options))
+        return 0
+
+
+def _handle(state: _State, cwd: str, args: Sequence[str]):
+    stdout, stderr = io.StringIO(), io.StringIO()
+    previous_cwd = os.getcwd()
+    try:
+        os.chdir(cwd)
+        with redirect_stdout(stdout), redirect_stderr(stderr):
+            code = state.run(args)
+    except SystemExit as exc:
+        if isinstance(exc.code, str):
+            print(exc.code, file=stderr)
+        code = exc.code if isinstance(exc.code, int) else 1
+    except Exception:  # NOTE: report to the client instead of stopping serving
+        traceback.print_exc(file=stderr)
+        code = 1
+    finally:
+        os.chdir(previous_cwd)
+
+    return {"code": code, "stdout": stdout.getvalue(), "stderr": stderr.getvalue()}
+
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+    server: "_Server"
+
+    def handle(self):
+        request = json.loads(self.rfile.readline())
+        if request.get("shutdown"):
+            response = {"code": 0, "stdout": "", "stderr": ""}
+            # NOTE: shutdown blocks until serving stopped, which happens on this thread
+            threading.Thread(target=self.server.shutdown).start()
+        else:
+            response = _handle(self.server.state, request["cwd"], request["args"])
+        self.wfile.write(json.dumps(response).encode("utf-8") + b"\n")
+
+
+class _Server(socketserver.UnixStreamServer):
+    # NOTE: requests are handled one at a time since they change the working
+    # dir and redirect the standard streams of the whole process
+    def __init__(self, socket_path: Path):
+        super().__init__(str(socket_path), _RequestHandler)
+        self.state = _State()
+
+
+def _is_listening(socket_path: Path):
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as connection:
+        try:
+            connection.connect(str(socket_path))
+            return True
+        except OSError:
+            return False
+
+
+def serve(socket_path: Path, ready: Optional[threading.Event] = None):
+    """Serve requests on the given socket until shut down by a client."""
+    if socket_path.exists():
+        if _is_listening(socket_path):
+            raise SystemExit(f"ERROR: A server is already listening on {socket_path}")
+        socket_path.unlink()
+
+    # NOTE: created accessible by the owner only, a chmod after binding would
+    # leave a window in which other users could connect
+    umask = os.umask(0o177)
+    try:
+        server = _Server(socket_path)
+    finally:
+        os.umask(umask)
+
+    with server:
+        if ready:
+            ready.set()
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            socket_path.unlink(missing_ok=True)
+
+
+def _make_argparser():
+    parser = ArgumentParser(
+        prog="python -m gladiator serve",
+        description="Serve generation requests sent by python -m gladiator.client",
+    )
+    parser.add_argument(
+        "--socket",
+        type=Path,
+        default=None,
+        help="socket to listen on (default: $GLADIATOR_SOCKET or $XDG_RUNTIME_DIR/gladiator.sock)",
+    )
+    return parser
+
+
+def cli(*args) -> int:
+    try:
+        options = _make_argparser().parse_args(args)
+    except SystemExit as exc:
+        return exc.code
+
+    serve(options.socket or get_default_socket_path())
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(cli(*sys.argv[1:]))
@@ -0,0 +1,298 @@
+"""Time the stages of the generator separately and compare against a baseline."""
+
+from argparse import ArgumentParser
+import json
+from pathlib import Path
+import platform
+import sys
+import tempfile
+import timeit
+from typing import Callable, Iterable, Iterator, List, Mapping, Optional, Sequence
+
+import attr
+
+from gladiator import __version__
+from gladiator.__main__ import cli as gladiator_cli
+from gladiator.cache import load_index
+from gladiator.options import Case, Options
+from gladiator.parse.command import clear_caches as clear_type_caches
+from gladiator.parse.command import parse_required_commands
+from gladiator.parse.enum import parse_required_enums
+from gladiator.parse.feature import (
+    Feature,
+    FeatureApi,
+    FeatureVersion,
+    get_feature_requirements,
+)
+from gladiator.parse.spec import build_spec_index, load_spec
+from gladiator.pipeline import _filter_unneeded_groups
+from gladiator.prepare.command import prepare_commands
+from gladiator.prepare.enum import prepare_enums
+from gladiator.prepare.style import clear_caches, transform_symbol
+
+_RESULTS_FORMAT = 1
+_DEFAULT_FEATURE = Feature(api=FeatureApi.GL, version=FeatureVersion(major=4, minor=6))
+
+# NOTE: differences below this are timer noise rather than regressions
+_NOISE_FLOOR = 0.0005
+
+_CLI_CONFIGS = {
+    "cli global": ("--api", "gl", "--version", "4.6"),
+    "cli object": ("--api", "gl", "--version", "3.3", "--scope", "object"),
+    "cli resource wrappers": (
+        *("--api", "gl", "--version", "4.6"),
+        "--generate-resource-wrappers",
+    ),
+    "cli multi-api": ("--api", "gl", "gles2", "--version", "4.3", "3.0"),
+}
+
+
+@attr.s(auto_attribs=True, kw_only=True, slots=True, frozen=True)
+class Benchmark:
+    """A named stage and a function running it once."""
+
+    name: str
+    run: Callable[[], object]
+
+
+@attr.s(auto_attribs=True, kw_only=True, slots=True, frozen=True)
+class Change:
+    """The time of a benchmark in the baseline and in the current results."""
+
+    name: str
+    baseline: float
+    current: float
+
+    @property
+    def ratio(self):
+        return self.current / self.baseline if self.baseline else float("inf")
+
+    def is_regression(self, tolerance: float):
+        """Determine whether the current time exceeds the tolerated slowdown."""
+        return (
+            self.current > self.baseline * (1 + tolerance)
+            and self.current - self.baseline > _NOISE_FLOOR
+        )
+
+
+def _resolve_all_features(index):
+    # NOTE: drop the memoized timelines so building them is measured as well
+    index.timelines.clear()
+    for feature in index.features:
+        get_feature_requirements(feature, index)
+
+
+def _parse_all_commands(names: Iterable[str], index):
+    # NOTE: drop the memoized types so parsing them is measured as well
+    clear_type_caches()
+    return tuple(parse_required_commands(names, index))
+
+
+def _transform_all(symbols: Sequence[str], case: Case):
+    clear_caches()
+    for symbol in symbols:
+        transform_symbol(symbol, case, True)
+
+
+def _run_cli(spec_file: Path, cache_dir: Path, output: Path, args: Sequence[str]):
+    common = ("--spec-file", str(spec_file), "--cache-dir", str(cache_dir))
+    assert gladiator_cli(*common, "--output", str(output), *args) == 0
+
+
+def make_benchmarks(spec_file: Path, work_dir: Path) -> Iterator[Benchmark]:
+    """Prepare the inputs of every stage from the given spec file and yield the
+    benchmarks. Temporary files are written to the given dir.
+    """
+    index = build_spec_index(load_spec(spec_file))
+    requirements = get_feature_requirements(_DEFAULT_FEATURE, index)
+    commands = tuple(parse_required_commands(requirements.commands.keys(), index))
+    enums = _filter_unneeded_groups(
+        parse_required_enums(requirements.enums.keys(), index), commands
+    )
+    options = Options(api=(_DEFAULT_FEATURE.api,), version=(_DEFAULT_FEATURE.version,))
+    prepared_enums = dict(prepare_enums(enums, options))
+    symbols = (*index.commands.keys(), *index.enums.keys())
+
+    cache_dir = work_dir / "cache"
+    load_index(spec_file, cache_dir)
+
+    yield Benchmark(
+        name="load spec", run=lambda: build_spec_index(load_spec(spec_file))
+    )
+    yield Benchmark(
+        name="load cached index", run=lambda: load_index(spec_file, cache_dir)
+    )
+    yield Benchmark(
+        name="feature requirements", run=lambda: _resolve_all_features(index)
+    )
+    yield Benchmark(
+        name="parse enums",
+        run=lambda: tuple(parse_required_enums(requirements.enums.keys(), index)),
+    )
+    yield Benchmark(
+        name="parse commands",
+        run=lambda: _parse_all_commands(requirements.commands.keys(), index),
+    )
+    for case in Case:
+        yield Benchmark(
+            name=f"transform symbol ({case.value})",
+            run=lambda case=case: _transform_all(symbols, case),
+        )
+    yield Benchmark(
+        name="prepare commands",
+        run=lambda: dict(prepare_commands(commands, prepared_enums, options)),
+    )
+    for position, (name, args) in enumerate(_CLI_CONFIGS.items()):
+        output = work_dir / f"opengl{position}.hxx"
+        yield Benchmark(
+            name=name,
+            run=lambda args=args, output=output: _run_cli(
+                spec_file, cache_dir, output, args
+            ),
+        )
+
+
+def run_benchmarks(benchmarks: Iterable[Benchmark], repeat: int) -> Iterator:
+    """Run each benchmark the given number of times and yield its name and its
+    fastest time in seconds.
+    """
+    for benchmark in benchmarks:
+        # NOTE: timeit disables the garbage collector while timing
+        times = timeit.Timer(benchmark.run).repeat(repeat=repeat, number=1)
+        yield benchmark.name, min(times)
+
+
+def compare_results(
+    baseline: Mapping[str, float], current: Mapping[str, float]
+) -> List[Change]:
+    """Pair the times of all benchmarks present in both results."""
+    return [
+        Change(name=name, baseline=baseline[name], current=seconds)
+        for name, seconds in current.items()
+        if name in baseline
+    ]
+
+
+def _make_report(spec_file: Path, repeat: int, results: Mapping[str, float]):
+    return {
+        "format": _RESULTS_FORMAT,
+        "gladiator": __version__,
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "spec_file": Path(spec_file).name,
+        "repeat": repeat,
+        "results": dict(results),
+    }
+
+
+def _read_baseline(path: Path) -> Mapping[str, float]:
+    report = json.loads(path.read_text(encoding="utf-8"))
+    if report.get("format") != _RESULTS_FORMAT:
+        raise SystemExit(f"ERROR: {path} is not a baseline of this version")
+    return report["results"]
+
+
+def _print_results(
+    results: Mapping[str, float], changes: Mapping[str, Change], tolerance: float
+):
+    print(f"{'benchmark':<36}{'time [ms]':>12}{'baseline':>12}{'change':>9}")
+    for name, seconds in results.items():
+        line = f"{name:<36}{seconds * 1000:>12.2f}"
+        change = changes.get(name)
+        if change:
+            line += f"{change.baseline * 1000:>12.2f}{change.ratio - 1:>+9.1%}"
+            if change.is_regression(tolerance):
+                line += "  REGRESSION"
+        print(line)
+
+
+def _make_argparser():
+    parser = ArgumentParser(
+        description="Time the stages of the generator and compare against a baseline"
+    )
+    parser.add_argument(
+        "--spec-file",
+        type=Path,
+        default=Options().spec_file,
+        help="OpenGL spec file to run the benchmarks on (default: the test registry)",
+    )
+    parser.add_argument(
+        "--select",
+        nargs="+",
+        default=None,
+        help="only run benchmarks whose names contain any of the given strings",
+    )
+    parser.add_argument(
+        "--repeat",
+        type=int,
+        default=5,
+        help="runs per benchmark, of which the fastest is reported (default: 5)",
+    )
+    parser.add_argument(
+        "--output", type=Path, default=None, help="file to write the results to"
+    )
+    parser.add_argument(
+        "--baseline",
+        type=Path,
+        default=None,
+        help="results to compare against; fails if any benchmark regressed",
+    )
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.2,
+        help="tolerated relative slowdown against the baseline (default: 0.2)",
+    )
+    parser.add_argument(
+        "--list",
+        action="store_true",
+        default=False,
+        help="list the benchmarks instead of running them",
+    )
+    return parser
+
+
+def _is_selected(name: str, select: Optional[Sequence[str]]):
+    return select is None or any(s in name for s in select)
+
+
+def cli(*args) -> int:
+    try:
+        options = _make_argparser().parse_args(args)
+    except SystemExit as exc:
+        return exc.code
+
+    baseline = _read_baseline(options.baseline) if options.baseline else {}
+    with tempfile.TemporaryDirectory(prefix="gladiator-benchmark-") as work_dir:
+        benchmarks = [
+            b
+            for b in make_benchmarks(options.spec_file, Path(work_dir))
+            if _is_selected(b.name, options.select)
+        ]
+        if options.list:
+            print("\n".join(b.name for b in benchmarks))
+            return 0
+
+        results = dict(run_benchmarks(benchmarks, options.repeat))
+
+    changes = {c.name: c for c in compare_results(baseline, results)}
+    _print_results(results, changes, options.tolerance)
+    if options.output:
+        report = _make_report(options.spec_file, options.repeat, results)
+        options.output.write_text(json.dumps(report, indent=2) + "\n", encoding="utf-8")
+
+    missing = [name for name in baseline if name not in results]
+    if missing and not options.select:
+        print(f"not run but in the baseline: {', '.join(missing)}", file=sys.stderr)
+    regressions = [c for c in changes.values() if c.is_regression(options.tolerance)]
+    if regressions:
+        names = ", ".join(c.name for c in regressions)
+        print(
+            f"ERROR: {len(regressions)} benchmarks regressed: {names}", file=sys.stderr
+        )
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(cli(*sys.argv[1:]))
@@ -0,0 +1,48 @@
+"""Manage the spec index cache."""
+
+from argparse import ArgumentParser
+from datetime import timedelta
+from pathlib import Path
+import sys
+
+from gladiator.cache import get_default_cache_dir, prune_cache
+
+
+def _make_argparser():
+    parser = ArgumentParser(description="Manage the cache of parsed spec files")
+    parser.add_argument(
+        "--cache-dir",
+        type=Path,
+        default=None,
+        help="cache dir (default: $GLADIATOR_CACHE_DIR or ~/.cache/gladiator)",
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+    prune = commands.add_parser(
+        "prune", help="remove entries of other versions and unused entries"
+    )
+    prune.add_argument(
+        "--max-age",
+        type=int,
+        default=30,
+        help="remove entries not used within this many days (default: 30)",
+    )
+    commands.add_parser("clear", help="remove all entries")
+    return parser
+
+
+def cli(*args) -> int:
+    try:
+        options = _make_argparser().parse_args(args)
+    except SystemExit as exc:
+        return exc.code
+
+    cache_dir = options.cache_dir or get_default_cache_dir()
+    max_age = timedelta(days=options.max_age) if options.command == "prune" else None
+    for path in prune_cache(cache_dir, max_age):
+        print(f"removed {path}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(cli(*sys.argv[1:]))
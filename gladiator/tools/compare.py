@@ -1,11 +1,17 @@
 """Compare the features of multiple APIs and versions."""
 
-from argparse import ArgumentParser
+from argparse import ArgumentParser, ArgumentTypeError
+from itertools import combinations
+import json
 import sys
-from typing import Iterable, Sequence, Tuple
+from typing import Dict, Iterable, List, Mapping, Sequence, Tuple, Union
 import xml.etree.ElementTree as xml
-from gladiator.options import add_feature_level_options
 
+import attr
+
+from gladiator.cache import get_default_cache_dir, load_index
+from gladiator.options import add_feature_level_options
+from gladiator.parse.index import SpecIndex
 from gladiator.parse.feature import (
     Feature,
     FeatureApi,
@@ -25,6 +31,10 @@ def _get_feature_nodes(spec_root: xml.Element):
 
 
 def _get_valid_features(feature_nodes):
+    if isinstance(feature_nodes, SpecIndex):
+        yield from feature_nodes.features.keys()
+        return
+
     for node in feature_nodes:
         yield _parse_feature(node)
 
@@ -36,12 +46,16 @@ def _check_requirements(req, nodes, feature):
 
 
 def get_all_feature_requirements(
-    spec_root: xml.Element,
+    spec_root: Union[xml.Element, SpecIndex],
     apis: Iterable[FeatureApi],
     versions: Iterable[FeatureVersion],
 ):
-    """Get all features and their requirements from the spec."""
-    feature_nodes = tuple(_get_feature_nodes(spec_root))
+    """Get all features and their requirements from the spec or its index."""
+    feature_nodes = (
+        spec_root
+        if isinstance(spec_root, SpecIndex)
+        else tuple(_get_feature_nodes(spec_root))
+    )
     for api, version in zip(apis, versions):
         feature = Feature(api=api, version=version)
         requirements = get_feature_requirements(feature, feature_nodes)
@@ -49,30 +63,9 @@ def get_all_feature_requirements(
         yield feature, requirements
 
 
-def _is_enum_shared(enum: str, requirements: Sequence[Requirements]):
-    for req in requirements:
-        if enum not in req.enums:
-            return False
-    return True
-
-
-def _is_command_shared(cmd: str, requirements: Sequence[Requirements]):
-    for req in requirements:
-        if cmd not in req.commands:
-            return False
-    return True
-
-
-def _merge_enums(first, others):
-    for enum, level in first.enums.items():
-        if _is_enum_shared(enum, others):
-            yield enum, level
-
-
-def _merge_commands(first, others):
-    for cmd, level in first.commands.items():
-        if _is_command_shared(cmd, others):
-            yield cmd, level
+def _intersect(first: Mapping[str, FeatureVersion], others: Iterable[Iterable[str]]):
+    shared = set(first).intersection(*others)
+    return {name: level for name, level in first.items() if name in shared}
 
 
 def merge_requirements(
@@ -85,35 +78,218 @@ def merge_requirements(
     first = requirements[0][1]
     others = [t[1] for t in requirements[1:]]
     return _MERGED_FEATURE, Requirements(
-        enums=dict(_merge_enums(first, others)),
-        commands=dict(_merge_commands(first, others)),
+        enums=_intersect(first.enums, (o.enums.keys() for o in others)),
+        commands=_intersect(first.commands, (o.commands.keys() for o in others)),
         is_merged=True,
     )
 
 
+class _InternedSets:
+    """Sets of names stored as bitsets over a shared table of names."""
+
+    def __init__(self, sets: Iterable[Iterable[str]]):
+        positions: Dict[str, int] = {}
+        self.masks: List[int] = []
+        for names in sets:
+            mask = 0
+            for name in names:
+                mask |= 1 << positions.setdefault(name, len(positions))
+            self.masks.append(mask)
+        self.names = tuple(positions)
+
+    def to_names(self, mask: int):
+        """Resolve a bitset to its names in table order."""
+        names = []
+        while mask:
+            lowest = mask & -mask
+            names.append(self.names[lowest.bit_length() - 1])
+            mask ^= lowest
+        return names
+
+
+@attr.s(auto_attribs=True, kw_only=True, slots=True, frozen=True)
+class Comparison:
+    """Shared and unique enums and commands of a set of features."""
+
+    features: Sequence[Feature]
+    shared_enums: Sequence[str]
+    shared_commands: Sequence[str]
+    unique_enums: Mapping[Feature, Sequence[str]]
+    unique_commands: Mapping[Feature, Sequence[str]]
+
+
+def _compare_subset(interned: _InternedSets, members: Sequence[int]):
+    shared = interned.masks[members[0]]
+    for member in members[1:]:
+        shared &= interned.masks[member]
+
+    for member in members:
+        others = 0
+        for other in members:
+            if other != member:
+                others |= interned.masks[other]
+        yield member, interned.masks[member] & ~others
+
+    yield None, shared
+
+
+def compare_features(
+    requirements: Sequence[Tuple[Feature, Requirements]], subset_size: int = 2
+) -> Iterable[Comparison]:
+    """Compare every subset of the given size of the given features in one pass
+    over bitsets of their interned enum and command names.
+    """
+    features = [feature for feature, _ in requirements]
+    enums = _InternedSets(req.enums.keys() for _, req in requirements)
+    commands = _InternedSets(req.commands.keys() for _, req in requirements)
+
+    for members in combinations(range(len(requirements)), subset_size):
+        enum_sets = dict(_compare_subset(enums, members))
+        command_sets = dict(_compare_subset(commands, members))
+        yield Comparison(
+            features=[features[m] for m in members],
+            shared_enums=enums.to_names(enum_sets.pop(None)),
+            shared_commands=commands.to_names(command_sets.pop(None)),
+            unique_enums={
+                features[m]: enums.to_names(mask) for m, mask in enum_sets.items()
+            },
+            unique_commands={
+                features[m]: commands.to_names(mask) for m, mask in command_sets.items()
+            },
+        )
+
+
+def _to_subset_size(value: str):
+    try:
+        size = int(value)
+    except ValueError as exc:
+        raise ArgumentTypeError("must be a number") from exc
+
+    if size < 2:
+        raise ArgumentTypeError("must compare at least 2 features")
+    return size
+
+
 def _make_argparser():
     parser = ArgumentParser(
         description="Determine the lowest common denominator across APIs and versions"
     )
-    add_feature_level_options(parser)
+    add_feature_level_options(parser, required=False)
+    parser.add_argument(
+        "--matrix",
+        action="store_true",
+        default=False,
+        help="compare every subset of the given features (default: all features in the spec)",
+    )
+    parser.add_argument(
+        "--subset-size",
+        type=_to_subset_size,
+        default=2,
+        help="number of features per compared subset in matrix mode (default: 2)",
+    )
+    parser.add_argument(
+        "--json",
+        action="store_true",
+        default=False,
+        help="print results as JSON",
+    )
+    parser.add_argument(
+        "--with-names",
+        action="store_true",
+        default=False,
+        help="list the names of all enums and commands in matrix mode",
+    )
     return parser
 
 
-def _print_requirements(requirements: Requirements):
+def _print_requirements(requirements: Requirements, as_json: bool):
+    if as_json:
+        intersection = {
+            "enums": list(requirements.enums.keys()),
+            "commands": list(requirements.commands.keys()),
+        }
+        print(json.dumps(intersection, indent=2))
+        return
+
+    print(f"Enum intersection ({len(requirements.enums)})")
+    print("----------------------------------")
+    print("\n".join(requirements.enums.keys()))
+    print()
     print(f"Command intersection ({len(requirements.commands)})")
     print("----------------------------------")
     print("\n".join(requirements.commands.keys()))
 
 
+def _summarize(names: Sequence[str], with_names: bool):
+    return names if with_names else len(names)
+
+
+def _comparison_to_json(comparison: Comparison, with_names: bool):
+    return {
+        "features": [str(f) for f in comparison.features],
+        "shared": {
+            "enums": _summarize(comparison.shared_enums, with_names),
+            "commands": _summarize(comparison.shared_commands, with_names),
+        },
+        "unique": {
+            str(f): {
+                "enums": _summarize(comparison.unique_enums[f], with_names),
+                "commands": _summarize(comparison.unique_commands[f], with_names),
+            }
+            for f in comparison.features
+        },
+    }
+
+
+def _print_matrix(comparisons: Iterable[Comparison], as_json: bool, with_names: bool):
+    if as_json:
+        json.dump(
+            [_comparison_to_json(c, with_names) for c in comparisons],
+            sys.stdout,
+            indent=2,
+        )
+        print()
+        return
+
+    for comparison in comparisons:
+        unique = ", ".join(
+            f"{f}: {len(comparison.unique_commands[f])}" for f in comparison.features
+        )
+        print(
+            f"{' & '.join(str(f) for f in comparison.features)}: "
+            f"{len(comparison.shared_commands)} shared commands, "
+            f"{len(comparison.shared_enums)} shared enums (unique commands: {unique})"
+        )
+
+
 def cli(*args) -> int:
     try:
         options = _make_argparser().parse_args(args)
     except SystemExit as exc:
         return exc.code
 
-    spec = xml.parse(options.spec_file).getroot()
-    reqs = tuple(get_all_feature_requirements(spec, options.api, options.version))
-    _print_requirements(merge_requirements(reqs)[1])
+    if not options.matrix and not (options.api and options.version):
+        raise SystemExit("ERROR: Must specify --api and --version")
+    if len(options.api or ()) != len(options.version or ()):
+        raise SystemExit("ERROR: Must specify a version for every API")
+
+    spec = load_index(options.spec_file, get_default_cache_dir())
+    if options.matrix and not options.api:
+        apis = [f.api for f in spec.features.keys()]
+        versions = [f.version for f in spec.features.keys()]
+    else:
+        apis, versions = options.api, options.version
+
+    reqs = tuple(get_all_feature_requirements(spec, apis, versions))
+    if options.matrix and options.subset_size > len(reqs):
+        raise SystemExit(
+            f"ERROR: Cannot compare subsets of {options.subset_size} of {len(reqs)} features"
+        )
+    if options.matrix:
+        comparisons = compare_features(reqs, options.subset_size)
+        _print_matrix(comparisons, options.json, options.with_names)
+    else:
+        _print_requirements(merge_requirements(reqs)[1], options.json)
 
     return 0
 
@@ -0,0 +1,81 @@
+"""Prebuild the bytecode of the default templates shipped with the package."""
+
+from argparse import ArgumentParser
+from pathlib import Path
+import sys
+from typing import Set
+
+from jinja2.bccache import Bucket
+
+from gladiator.cache import get_bytecode_path
+from gladiator.generate.templates import (
+    make_loader_environment,
+    PREBUILT_BYTECODE_DIR,
+    TemplateBytecodeCache,
+)
+
+
+class _RecordingBytecodeCache(TemplateBytecodeCache):
+    """Record the bytecode files of all templates compiled or loaded."""
+
+    def __init__(self, output_dir: Path):
+        super().__init__(output_dir, prebuilt_dir=None)
+        self.paths: Set[Path] = set()
+
+    def get_bucket(self, environment, name, filename, source) -> Bucket:
+        bucket = super().get_bucket(environment, name, filename, source)
+        self.paths.add(get_bytecode_path(self.cache_dir, bucket.key))
+        return bucket
+
+
+def _check_output_dir(output_dir: Path):
+    # NOTE: stale bytecode is removed, so other files must never be in reach
+    if (
+        not output_dir.exists()
+        or output_dir.resolve() == PREBUILT_BYTECODE_DIR.resolve()
+    ):
+        return
+    if not output_dir.is_dir() or any(output_dir.iterdir()):
+        raise SystemExit(
+            f"ERROR: {output_dir} is neither {PREBUILT_BYTECODE_DIR} nor new or empty"
+        )
+
+
+def _make_argparser():
+    parser = ArgumentParser(
+        description="Compile the default templates ahead of time (run before packaging)"
+    )
+    parser.add_argument(
+        "--output-dir",
+        type=Path,
+        default=PREBUILT_BYTECODE_DIR,
+        help=f"dir to write bytecode to (default: {PREBUILT_BYTECODE_DIR})",
+    )
+    return parser
+
+
+def cli(*args) -> int:
+    try:
+        options = _make_argparser().parse_args(args)
+    except SystemExit as exc:
+        return exc.code
+
+    _check_output_dir(options.output_dir)
+    cache = _RecordingBytecodeCache(options.output_dir)
+    env = make_loader_environment(None, bytecode_cache=cache)
+    for name in env.list_templates():
+        env.get_template(name)
+        print(f"compiled {name}")
+
+    # NOTE: only bytecode of outdated templates, as written by this tool before
+    pattern = get_bytecode_path(Path(), "*").name
+    for path in sorted(options.output_dir.glob(pattern)):
+        if path not in cache.paths:
+            path.unlink()
+            print(f"removed {path.name}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(cli(*sys.argv[1:]))
@@ -0,0 +1,127 @@
+"""Prune commands that are not used by the code the output is generated for."""
+
+import json
+from pathlib import Path
+import re
+import sys
+from typing import Iterable, Iterator, Sequence, Set
+
+import attr
+
+from gladiator.options import Options
+from gladiator.parse.command import Command
+from gladiator.prepare.style import transform_symbols
+from gladiator.resources import get_resource_table
+
+_IDENTIFIER_PATTERN = re.compile(r"[A-Za-z_][A-Za-z0-9_]*")
+
+
+def scan_used_symbols(files: Iterable[Path]) -> Set[str]:
+    """Collect all identifiers in the given C++ sources or symbol lists."""
+    used: Set[str] = set()
+    for path in files:
+        try:
+            text = Path(path).read_text(encoding="utf-8", errors="replace")
+        except OSError as exc:
+            raise SystemExit(f"ERROR: cannot scan {path}: {exc.strerror}") from exc
+        used.update(_IDENTIFIER_PATTERN.findall(text))
+    return used
+
+
+def _get_resource_wrapper_commands(used: Set[str], options: Options):
+    # NOTE: read from the table, the commands need not be prepared yet
+    for table in ("scoped_resources_multi", "scoped_resources_single"):
+        for row in get_resource_table(table):
+            create, delete, *names = row.split(",")
+            styled = transform_symbols(names, options.enum_case, True)
+            if any(name in used for name in styled):
+                yield create
+                yield delete
+
+
+def get_used_commands(
+    commands: Iterable[Command], used: Set[str], options: Options
+) -> Iterator[Command]:
+    """Yield the commands whose styled wrapper or original name is used. The
+    commands of used resource wrappers are kept if those are generated.
+    """
+    commands = tuple(commands)
+    names = transform_symbols(
+        (command.name for command in commands),
+        options.function_case,
+        options.omit_prefix,
+    )
+    wrapped = (
+        set(_get_resource_wrapper_commands(used, options))
+        if options.generate_resource_wrappers
+        else set()
+    )
+    for command, name in zip(commands, names):
+        if name in used or command.name in used or command.name in wrapped:
+            yield command
+
+
+@attr.s(auto_attribs=True, kw_only=True, slots=True, frozen=True)
+class PruneReport:
+    """Original names of the kept and pruned commands and enum groups."""
+
+    scanned_files: Sequence[str]
+    kept_commands: Sequence[str]
+    pruned_commands: Sequence[str]
+    kept_enums: Sequence[str]
+    pruned_enums: Sequence[str]
+
+    def to_json(self):
+        return {
+            "scanned_files": list(self.scanned_files),
+            "commands": {
+                "kept": list(self.kept_commands),
+                "pruned": list(self.pruned_commands),
+            },
+            "enums": {"kept": list(self.kept_enums), "pruned": list(self.pruned_enums)},
+        }
+
+    def format_summary(self):
+        commands = len(self.kept_commands) + len(self.pruned_commands)
+        enums = len(self.kept_enums) + len(self.pruned_enums)
+        return (
+            f"kept {len(self.kept_commands)} of {commands} commands and"
+            f" {len(self.kept_enums)} of {enums} enums used by"
+            f" {len(self.scanned_files)} files"
+        )
+
+
+def _split_names(all_names: Iterable[str], kept: Iterable[str]):
+    kept = set(kept)
+    pruned = [name for name in all_names if name not in kept]
+    return sorted(kept), sorted(pruned)
+
+
+def make_prune_report(
+    options: Options,
+    all_commands: Iterable[str],
+    commands: Iterable[str],
+    all_enums: Iterable[str],
+    enums: Iterable[str],
+) -> PruneReport:
+    """Compare the names of all candidates to the names of the kept ones."""
+    kept_commands, pruned_commands = _split_names(all_commands, commands)
+    kept_enums, pruned_enums = _split_names(all_enums, enums)
+    return PruneReport(
+        scanned_files=[str(path) for path in options.prune_unused],
+        kept_commands=kept_commands,
+        pruned_commands=pruned_commands,
+        kept_enums=kept_enums,
+        pruned_enums=pruned_enums,
+    )
+
+
+def write_prune_report(report: PruneReport, options: Options):
+    """Print a summary of the report to stderr and write it to the report file
+    if requested.
+    """
+    print(report.format_summary(), file=sys.stderr)
+    if options.prune_report:
+        Path(options.prune_report).write_text(
+            json.dumps(report.to_json(), indent=2) + "\n", encoding="utf-8"
+        )
@@ -0,0 +1,82 @@
+"""Test generating many targets in a single batch."""
+
+from pathlib import Path
+
+import pytest
+import yaml
+
+from gladiator.__main__ import cli
+from gladiator.batch import cli as batch_cli, parse_target, target_to_args
+
+
+TARGETS = {
+    "gl46.hxx": {"api": ["gl"], "version": ["4.6"]},
+    "gl33.hxx": {"api": ["gl"], "version": ["3.3"], "scope": "object"},
+    "merged.hxx": {
+        "api": ["gles2", "gl"],
+        "version": ["3.0", "4.3"],
+        "omit-prefix": True,
+        "function-case": "snake_case",
+        "generate-resource-wrappers": True,
+    },
+    "snake_case.hxx": {
+        "api": ["gl"],
+        "version": ["3.3"],
+        "enum-case": "snake_case",
+        "generate-resource-wrappers": True,
+    },
+    "wrappers.hxx": {
+        "api": ["gl"],
+        "version": ["3.3"],
+        "generate-resource-wrappers": True,
+    },
+}
+
+
+def test_target_to_args():
+    target = {"api": ["gl"], "version": ["4.6"], "omit-prefix": True, "scope": None}
+    assert target_to_args(target) == [
+        "--api",
+        "gl",
+        "--version",
+        "4.6",
+        "--omit-prefix",
+    ]
+
+
+def test_rejects_invalid_target():
+    with pytest.raises(SystemExit):
+        parse_target(["--spec-file", "gl.xml", "--api", "gl"])
+
+
+@pytest.mark.parametrize("jobs", [1, 2])
+def test_batch_matches_separate_runs(tmp_path: Path, resource_path: Path, jobs: int):
+    defaults = {"spec-file": str(resource_path / "gl.xml"), "no-cache": True}
+    manifest = tmp_path / "manifest.yaml"
+    manifest.write_text(
+        yaml.safe_dump(
+            {
+                "defaults": defaults,
+                "targets": [
+                    {**target, "output": str(tmp_path / "batch" / name)}
+                    for name, target in TARGETS.items()
+                ],
+            }
+        )
+    )
+    (tmp_path / "batch").mkdir()
+    assert batch_cli("--manifest", str(manifest), "--jobs", str(jobs)) == 0
+
+    for name, target in TARGETS.items():
+        output = tmp_path / name
+        assert cli(*target_to_args({**defaults, **target, "output": output})) == 0
+        assert (tmp_path / "batch" / name).read_text() == output.read_text()
+
+
+def test_batch_requires_outputs(resource_path: Path, tmp_path: Path):
+    config = tmp_path / "config.yaml"
+    config.write_text(
+        f"spec-file: {resource_path / 'gl.xml'}\napi: [gl]\nversion: ['4.6']\n"
+    )
+    with pytest.raises(SystemExit):
+        cli("batch", "--config-file", str(config))
@@ -0,0 +1,34 @@
+"""Test timing stages and comparing against a baseline."""
+
+import json
+from pathlib import Path
+
+from gladiator.tools.benchmark import Change, cli
+
+
+def _run(resource_path: Path, *args: str):
+    spec_file = str(resource_path / "gl.xml")
+    return cli(
+        "--spec-file", spec_file, "--select", "(initial)", "--repeat", "1", *args
+    )
+
+
+def test_regressions_fail(resource_path: Path, tmp_path: Path):
+    baseline = tmp_path / "baseline.json"
+    assert _run(resource_path, "--output", str(baseline)) == 0
+    report = json.loads(baseline.read_text())
+    assert list(report["results"]) == ["transform symbol (initial)"]
+
+    report["results"]["transform symbol (initial)"] = 1e3
+    baseline.write_text(json.dumps(report))
+    assert _run(resource_path, "--baseline", str(baseline)) == 0
+
+    report["results"]["transform symbol (initial)"] = 1e-9
+    baseline.write_text(json.dumps(report))
+    assert _run(resource_path, "--baseline", str(baseline)) == 1
+
+
+def test_noise_is_tolerated():
+    assert not Change(name="tiny", baseline=1e-5, current=1e-4).is_regression(0.2)
+    assert not Change(name="slow", baseline=1.0, current=1.1).is_regression(0.2)
+    assert Change(name="slow", baseline=1.0, current=1.3).is_regression(0.2)
@@ -0,0 +1,75 @@
+"""Test caching the spec index."""
+
+from datetime import timedelta
+import os
+import pickle
+from pathlib import Path
+import xml.etree.ElementTree as xml
+
+from gladiator.cache import load_index, prune_cache
+from gladiator.parse.command import parse_required_commands
+from gladiator.parse.enum import parse_required_enums
+from gladiator.parse.feature import (
+    get_feature_requirements,
+    Feature,
+    FeatureApi,
+    FeatureVersion,
+)
+from gladiator.parse.spec import build_spec_index
+from gladiator.parse.type import get_type_definitions
+
+
+TESTED_FEATURE = Feature(api=FeatureApi.GL, version=FeatureVersion(major=4, minor=6))
+
+
+def _parse(index):
+    requirements = get_feature_requirements(TESTED_FEATURE, index)
+    return (
+        requirements,
+        tuple(get_type_definitions(index)),
+        tuple(parse_required_enums(requirements.enums, index)),
+        tuple(parse_required_commands(requirements.commands, index)),
+    )
+
+
+def test_cached_index_matches(spec: xml.Element, resource_path: Path, tmp_path):
+    cold = load_index(resource_path / "gl.xml", tmp_path)
+    assert len(tuple(tmp_path.iterdir())) == 1
+
+    warm = load_index(resource_path / "gl.xml", tmp_path)
+    assert _parse(warm) == _parse(cold) == _parse(build_spec_index(spec))
+
+
+def test_corrupted_entry_is_rebuilt(resource_path: Path, tmp_path):
+    load_index(resource_path / "gl.xml", tmp_path)
+    entry = next(tmp_path.iterdir())
+    entry.write_bytes(b"garbage")
+
+    index = load_index(resource_path / "gl.xml", tmp_path)
+    assert "glClear" in index.commands
+    assert entry.stat().st_size > len(b"garbage")
+
+
+def test_malformed_entry_is_rebuilt(resource_path: Path, tmp_path):
+    load_index(resource_path / "gl.xml", tmp_path)
+    entry = next(tmp_path.iterdir())
+    with open(entry, "rb") as file:
+        encoded = pickle.load(file)
+    with open(entry, "wb") as file:
+        pickle.dump((*encoded[:-1], {}), file)
+
+    index = load_index(resource_path / "gl.xml", tmp_path)
+    assert len(index.extensions) > 0
+
+
+def test_prune(resource_path: Path, tmp_path):
+    load_index(resource_path / "gl.xml", tmp_path)
+    entry = next(tmp_path.iterdir())
+    foreign = tmp_path / "0.0.0-deadbeef.index"
+    foreign.write_bytes(b"")
+
+    assert tuple(prune_cache(tmp_path, timedelta(days=1))) == (foreign,)
+
+    os.utime(entry, (0, 0))
+    assert tuple(prune_cache(tmp_path, timedelta(days=1))) == (entry,)
+    assert not tuple(tmp_path.iterdir())
@@ -0,0 +1,248 @@
+"""Test writing generated code."""
+
+import os
+from pathlib import Path
+import random
+import re
+
+import pytest
+
+from gladiator.__main__ import cli
+from gladiator.generate.code import _Compressor
+from gladiator.resources import BASE_RESOURCE_PATH
+
+
+def _generate(resource_path: Path, output: Path, *args: str):
+    spec_file = str(resource_path / "gl.xml")
+    base_args = ("--spec-file", spec_file, "--api", "gl", "--version", "1.1")
+    assert cli(*base_args, "--no-cache", "--output", str(output), *args) == 0
+
+
+def test_unchanged_output_is_kept(resource_path: Path, tmp_path: Path):
+    output = tmp_path / "opengl.hxx"
+    _generate(resource_path, output)
+    os.utime(output, (0, 0))
+
+    _generate(resource_path, output)
+    assert output.stat().st_mtime == 0
+
+    _generate(resource_path, output, "--omit-prefix")
+    assert output.stat().st_mtime != 0
+    assert [p.name for p in tmp_path.iterdir()] == [output.name]
+
+
+def test_depfile_lists_loaded_files(resource_path: Path, tmp_path: Path):
+    overrides = tmp_path / "overrides"
+    overrides.mkdir()
+    (overrides / "before.jinja2").write_text("// generated\n")
+    (overrides / "unused.jinja2").write_text("")
+    output = tmp_path / "opengl.hxx"
+    depfile = tmp_path / "opengl.d"
+
+    _generate(
+        resource_path,
+        output,
+        *("--depfile", str(depfile), "--template-overrides-dir", str(overrides)),
+    )
+
+    target, dependencies = depfile.read_text().split(":", 1)
+    dependencies = dependencies.replace("\\\n", "").split()
+    assert target == str(output)
+    assert dependencies[0] == str((resource_path / "gl.xml").resolve())
+    assert str(BASE_RESOURCE_PATH / "templates" / "loader.jinja2") in dependencies
+    assert str(overrides / "before.jinja2") in dependencies
+    assert str(BASE_RESOURCE_PATH / "templates" / "before.jinja2") not in dependencies
+    assert str(overrides / "unused.jinja2") not in dependencies
+    assert output.read_text().startswith("// generated\n")
+
+
+def test_split_output(resource_path: Path, tmp_path: Path):
+    output_dir = tmp_path / "opengl"
+    depfile = tmp_path / "opengl.d"
+    spec_file = str(resource_path / "gl.xml")
+    assert (
+        cli(
+            *("--spec-file", spec_file, "--api", "gl", "--version", "1.1"),
+            *("--no-cache", "--output-dir", str(output_dir)),
+            *("--depfile", str(depfile)),
+        )
+        == 0
+    )
+
+    files = {p.name for p in output_dir.iterdir()}
+    headers = {"types.hxx", "enums_fwd.hxx", "enums.hxx", "gl_10.hxx", "gl_11.hxx"}
+    assert files == headers | {"loader.cxx"}
+    assert '#include "gl_10.hxx"' in (output_dir / "gl_11.hxx").read_text()
+    assert "extern _proc_glClear _glClear;" in (output_dir / "gl_10.hxx").read_text()
+
+    implementation = (output_dir / "loader.cxx").read_text()
+    assert "_proc_glClear _glClear = nullptr;" in implementation
+    assert "bool load_gl_11_functions(" in implementation
+
+    targets = depfile.read_text().split(":", 1)[0].split()
+    assert set(targets) == {str(output_dir / file) for file in files}
+
+
+def _compress_whole(code: str):
+    return re.sub("\n+", "\n", re.sub("^[\t ]+", "", code, flags=re.MULTILINE))
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_compressing_chunks_matches_whole(seed: int):
+    rng = random.Random(seed)
+    code = "".join(
+        rng.choice(["\n", " ", "\t", "a", "b ", "\n  \t"]) for _ in range(200)
+    )
+    cuts = sorted(rng.sample(range(len(code)), 30))
+    chunks = [code[begin:end] for begin, end in zip([0] + cuts, cuts + [len(code)])]
+
+    compressor = _Compressor()
+    assert "".join(map(compressor.compress, chunks)) == _compress_whole(code)
+
+
+@pytest.mark.parametrize("scope", ["global", "object", "context"])
+def test_parallel_rendering_matches_serial(
+    resource_path: Path, tmp_path: Path, scope: str
+):
+    for jobs in ("1", "3"):
+        _generate(
+            resource_path,
+            tmp_path / f"{jobs}.hxx",
+            *("--scope", scope, "--render-jobs", jobs),
+            *("--depfile", str(tmp_path / f"{jobs}.d")),
+        )
+
+    assert (tmp_path / "1.hxx").read_text() == (tmp_path / "3.hxx").read_text()
+    serial_dependencies = (tmp_path / "1.d").read_text().split(":", 1)[1].split()
+    parallel_dependencies = (tmp_path / "3.d").read_text().split(":", 1)[1].split()
+    assert set(serial_dependencies) == set(parallel_dependencies)
+
+
+def test_lazy_load(resource_path: Path, tmp_path: Path):
+    output = tmp_path / "opengl.hxx"
+    _generate(resource_path, output, "--lazy-load")
+
+    code = output.read_text()
+    assert "_proc_glClear _glClear = _lazy_glClear;" in code
+    assert '_glClear = (_proc_glClear)(_lazy_resolve("glClear"));' in code
+    assert "void* _lazy_resolve(const char* name) {" in code
+    assert "::_d::_lazy_load = load;" in code
+    assert '(load("glClear"))' not in code
+
+
+def test_lazy_load_requires_global_scope(resource_path: Path, tmp_path: Path):
+    with pytest.raises(SystemExit):
+        _generate(
+            resource_path, tmp_path / "opengl.hxx", "--lazy-load", "--scope", "object"
+        )
+
+
+def test_loader_table(resource_path: Path, tmp_path: Path):
+    output = tmp_path / "opengl.hxx"
+    _generate(resource_path, output, "--loader-table")
+
+    code = output.read_text()
+    assert "_proc_glClear _glClear" not in code
+    assert "_id_glCullFace = 0," in code
+    assert "_id_glDrawArrays = 306," in code
+    assert "void* _procs[336] = {};" in code
+    assert '"glClear\\0"' in code
+    assert "for (std::uint32_t id = 306; id < 336; ++id) {" in code
+    assert "((::_d::_proc_glClear)(::_d::_procs[::_d::_id_glClear]))(" in code
+
+
+@pytest.mark.parametrize(
+    "args", [("--scope", "object"), ("--lazy-load",)], ids=["object", "lazy"]
+)
+def test_loader_table_preconditions(resource_path: Path, tmp_path: Path, args):
+    with pytest.raises(SystemExit):
+        _generate(resource_path, tmp_path / "opengl.hxx", "--loader-table", *args)
+
+
+def test_context_scope(resource_path: Path, tmp_path: Path):
+    output = tmp_path / "opengl.hxx"
+    _generate(resource_path, output, "--scope", "context")
+
+    code = output.read_text()
+    assert "static thread_local void* const* procs = nullptr;" in code
+    assert "struct function_table {\nvoid* procs[336] = {};" in code
+    assert "inline void make_current(const function_table& table) noexcept {" in code
+    assert "bool load_gl_11_functions(function_table& table, const " in code
+    assert "load_gl_10_functions(table, load);" in code
+    assert "if ((table.procs[id] = load(name)) == nullptr) return false;" in code
+    assert "((::_d::_proc_glClear)(::_d::_current_procs()[::_d::_id_glClear]))(" in code
+
+
+def test_split_context_scope(resource_path: Path, tmp_path: Path):
+    output_dir = tmp_path / "opengl"
+    spec_file = str(resource_path / "gl.xml")
+    assert (
+        cli(
+            *("--spec-file", spec_file, "--api", "gl", "--version", "1.1"),
+            *("--no-cache", "--scope", "context", "--output-dir", str(output_dir)),
+        )
+        == 0
+    )
+
+    assert "struct function_table {" in (output_dir / "types.hxx").read_text()
+    assert "_id_glClear" in (output_dir / "gl_10.hxx").read_text()
+    assert (
+        "bool load_gl_11_functions(function_table& table,"
+        in (output_dir / "loader.cxx").read_text()
+    )
+
+
+def test_debug_output(resource_path: Path, tmp_path: Path):
+    output = tmp_path / "opengl.hxx"
+    _generate(resource_path, output)
+
+    code = output.read_text()
+    assert "#ifndef NDEBUG" in code
+    assert "_NDEBUG" not in code
+    assert "<iostream>" not in code
+    assert "glEnable(GL_DEBUG_OUTPUT_SYNCHRONOUS);" in code
+    assert (
+        "glDebugMessageControl(GL_DONT_CARE, GL_DONT_CARE, GL_DEBUG_SEVERITY_LOW, 0, nullptr, GL_TRUE);"
+        in code
+    )
+    assert "GL_DEBUG_SEVERITY_NOTIFICATION, 0, nullptr, GL_TRUE" not in code
+    assert "bool poll_debug_message(debug_message& message) noexcept {" in code
+
+
+def test_debug_output_filters(resource_path: Path, tmp_path: Path):
+    output = tmp_path / "opengl.hxx"
+    args = ("--debug-output", "asynchronous", "--debug-severities", "high")
+    _generate(resource_path, output, *args, "--debug-types", "error", "performance")
+
+    code = output.read_text()
+    assert "glEnable(GL_DEBUG_OUTPUT_SYNCHRONOUS);" not in code
+    controls = [line for line in code.splitlines() if "GL_TRUE);" in line]
+    assert controls == [
+        "glDebugMessageControl(GL_DONT_CARE, GL_DEBUG_TYPE_ERROR, GL_DEBUG_SEVERITY_HIGH, 0, nullptr, GL_TRUE);",
+        "glDebugMessageControl(GL_DONT_CARE, GL_DEBUG_TYPE_PERFORMANCE, GL_DEBUG_SEVERITY_HIGH, 0, nullptr, GL_TRUE);",
+    ]
+
+
+@pytest.mark.parametrize("scope", ["global", "object", "context"])
+def test_instrument(resource_path: Path, tmp_path: Path, scope: str):
+    output = tmp_path / "opengl.hxx"
+    _generate(resource_path, output, "--instrument", "--scope", scope)
+
+    code = output.read_text()
+    assert "_id_glCullFace = 0," in code
+    assert "constexpr std::size_t command_count = 336;" in code
+    assert (
+        "#ifdef GLADIATOR_INSTRUMENT\nconst ::_d::_call_scope _call(::_d::_id_glClear);\n#endif"
+        in code
+    )
+    assert "inline void dump_command_stats(std::FILE* const file = stderr) {" in code
+    assert "inline constexpr" not in code
+
+
+def test_no_instrument(resource_path: Path, tmp_path: Path):
+    output = tmp_path / "opengl.hxx"
+    _generate(resource_path, output)
+
+    code = output.read_text()
+    assert "GLADIATOR_INSTRUMENT" not in code
+    assert "_id_glClear" not in code
@@ -4,7 +4,7 @@ import xml.etree.ElementTree as xml
 
 import pytest
 
-from gladiator.parse.command import parse_required_commands
+from gladiator.parse.command import clear_caches, parse_required_commands
 from gladiator.parse.feature import (
     get_feature_requirements,
     Feature,
@@ -95,3 +95,22 @@ def test_parse_array_params(spec: xml.Element):
                 assert "*" in (
                     param.type_.back_modifiers or []
                 ), f"invalid array param {param.name} of command {command.name}"
+
+
+def test_types_are_interned(spec: xml.Element):
+    commands = {c.name: c for c in _collect_commands(spec)}
+    tex_image = next(iter(commands["glTexImage2D"].params))
+    tex_parameter = next(iter(commands["glTexParameteri"].params))
+
+    assert tex_image.name == tex_parameter.name == "target"
+    assert tex_image.type_ is tex_parameter.type_
+    assert commands["glClear"].return_type is commands["glFlush"].return_type
+
+
+def test_clearing_caches_parses_types_again(spec: xml.Element):
+    before = {c.name: c for c in _collect_commands(spec)}
+    clear_caches()
+    after = {c.name: c for c in _collect_commands(spec)}
+
+    assert after["glClear"].return_type == before["glClear"].return_type
+    assert after["glClear"].return_type is not before["glClear"].return_type
@@ -0,0 +1,82 @@
+"""Test comparing the features of multiple APIs and versions."""
+
+import json
+from pathlib import Path
+import xml.etree.ElementTree as xml
+
+import pytest
+
+from gladiator.parse.feature import FeatureApi, FeatureVersion
+from gladiator.parse.spec import build_spec_index
+from gladiator.tools.compare import (
+    cli,
+    compare_features,
+    get_all_feature_requirements,
+    merge_requirements,
+)
+
+
+def _get_requirements(spec: xml.Element):
+    return tuple(
+        get_all_feature_requirements(
+            build_spec_index(spec),
+            (FeatureApi.GL, FeatureApi.GLES2, FeatureApi.GLES2),
+            (
+                FeatureVersion(major=3, minor=3),
+                FeatureVersion(major=3, minor=0),
+                FeatureVersion(major=2, minor=0),
+            ),
+        )
+    )
+
+
+def test_merge_requirements(spec: xml.Element):
+    requirements = _get_requirements(spec)
+    _, merged = merge_requirements(requirements)
+
+    assert merged.is_merged
+    assert list(merged.commands) == [
+        cmd
+        for cmd in requirements[0][1].commands
+        if all(cmd in req.commands for _, req in requirements)
+    ]
+
+
+def test_compare_features(spec: xml.Element):
+    requirements = _get_requirements(spec)
+    comparisons = tuple(compare_features(requirements, subset_size=2))
+    assert len(comparisons) == 3
+
+    (gl_33, gl_req), (gles_30, gles_req) = requirements[0:2]
+    pair = comparisons[0]
+    assert pair.features == [gl_33, gles_30]
+    assert set(pair.shared_commands) == set(gl_req.commands) & set(gles_req.commands)
+    assert set(pair.unique_enums[gles_30]) == set(gles_req.enums) - set(gl_req.enums)
+    assert "glBegin" not in pair.shared_commands
+
+    everything = next(iter(compare_features(requirements, subset_size=3)))
+    _, merged = merge_requirements(requirements)
+    assert set(everything.shared_commands) == set(merged.commands)
+
+
+@pytest.mark.parametrize("size", ["0", "1", "x"])
+def test_reject_too_small_subset_size(resource_path: Path, size: str):
+    spec_file = str(resource_path / "gl.xml")
+    assert cli("--spec-file", spec_file, "--matrix", "--subset-size", size) == 2
+
+
+def test_reject_subset_size_above_feature_count(resource_path: Path):
+    args = ("--spec-file", str(resource_path / "gl.xml"), "--matrix")
+    with pytest.raises(SystemExit):
+        cli(*args, "--api", "gl", "gl", "--version", "1.0", "1.1", "--subset-size", "3")
+
+
+def test_intersection_json_lists_enums_and_commands(
+    resource_path: Path, capsys: pytest.CaptureFixture
+):
+    args = ("--spec-file", str(resource_path / "gl.xml"), "--json")
+    assert cli(*args, "--api", "gl", "gles2", "--version", "3.3", "3.0") == 0
+    intersection = json.loads(capsys.readouterr().out)
+
+    assert "GL_TRIANGLES" in intersection["enums"]
+    assert "glClear" in intersection["commands"]
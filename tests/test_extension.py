@@ -1,9 +1,20 @@
 """Test extension definition parsing."""
 
+from pathlib import Path
 import xml.etree.ElementTree as xml
 
-from gladiator.parse.feature import FeatureApi
-from gladiator.parse.extension import parse_required_extensions
+import pytest
+
+from gladiator.__main__ import cli
+from gladiator.parse.feature import Feature, FeatureApi, FeatureVersion
+from gladiator.parse.extension import (
+    get_extension,
+    get_supported_extension_names,
+    parse_required_extensions,
+)
+from gladiator.parse.index import SpecIndex
+from gladiator.parse.spec import build_spec_index
+from gladiator.prepare.extension import hash_name, prepare_extension_set
 
 
 def test_generate_extensions(spec: xml.Element):
@@ -41,3 +52,129 @@ def test_generate_extensions(spec: xml.Element):
             assert support_gles2.api == FeatureApi.GLES2
             assert not support_gles2.max_version
             assert not support_gles2.min_version
+
+
+@pytest.fixture(scope="module")
+def index(spec: xml.Element) -> SpecIndex:
+    return build_spec_index(spec)
+
+
+def test_indexed_extension_matches_nodes(spec: xml.Element, index: SpecIndex):
+    name = "GL_AMD_framebuffer_multisample_advanced"
+    extensions_node = next(node for node in spec if node.tag == "extensions")
+    expected = next(parse_required_extensions(extensions_node, [name]))
+    assert get_extension(index, name, FeatureApi.GL) == expected
+    assert get_extension(index, "GL_NOT_AN_EXTENSION", FeatureApi.GL) is None
+
+
+def test_indexed_extension_is_resolved_per_api(index: SpecIndex):
+    gl_debug = get_extension(index, "GL_KHR_debug", FeatureApi.GL)
+    gles_debug = get_extension(index, "GL_KHR_debug", FeatureApi.GLES2)
+    assert "glDebugMessageCallback" in gl_debug.required_commands
+    assert "glDebugMessageCallbackKHR" not in gl_debug.required_commands
+    assert "glDebugMessageCallbackKHR" in gles_debug.required_commands
+
+    core = Feature(api=FeatureApi.GL, version=FeatureVersion(major=3, minor=3))
+    legacy = Feature(api=FeatureApi.GL, version=FeatureVersion(major=2, minor=1))
+    compatibility_only = get_extension(index, "GL_ARB_texture_float", FeatureApi.GL)
+    assert gl_debug.is_supported(core) and gl_debug.is_supported(legacy)
+    assert compatibility_only.is_supported(legacy)
+    assert not compatibility_only.is_supported(core)
+
+
+def _generate(resource_path: Path, output: Path, *args: str):
+    spec_file = str(resource_path / "gl.xml")
+    base_args = ("--spec-file", spec_file, "--api", "gl", "--version", "3.3")
+    return cli(*base_args, "--no-cache", "--output", str(output), *args)
+
+
+def test_generate_extension_levels(resource_path: Path, tmp_path: Path):
+    output = tmp_path / "opengl.hxx"
+    extensions = ("GL_KHR_debug", "GL_ARB_debug_output", "GL_ARB_bindless_texture")
+    assert _generate(resource_path, output, "--extensions", *extensions) == 0
+
+    code = output.read_text()
+    assert 'load("glDebugMessageCallback")' in code
+    assert 'load("glDebugMessageCallbackARB")' in code
+    assert 'load("glDebugMessageCallbackKHR")' not in code
+    assert 'load("glMultiDrawArraysIndirect")' not in code
+    for name in ("KHR_debug", "ARB_debug_output", "ARB_bindless_texture"):
+        assert f"bool load_{name}_functions(" in code
+
+
+@pytest.mark.parametrize("extension", ["GL_NOT_AN_EXTENSION", "GL_ARB_texture_float"])
+def test_reject_unavailable_extensions(
+    resource_path: Path, tmp_path: Path, extension: str
+):
+    with pytest.raises(SystemExit):
+        _generate(resource_path, tmp_path / "opengl.hxx", "--extensions", extension)
+
+
+def test_reject_extensions_without_shared_requirements(
+    resource_path: Path, tmp_path: Path
+):
+    # NOTE: GL ES names the commands of KHR_debug with a KHR suffix, GL does not
+    spec_file = str(resource_path / "gl.xml")
+    args = ("--spec-file", spec_file, "--api", "gles2", "gl", "--version", "2.0", "3.3")
+    with pytest.raises(SystemExit):
+        cli(
+            *args,
+            "--no-cache",
+            "--output",
+            str(tmp_path / "opengl.hxx"),
+            "--extensions",
+            "GL_KHR_debug",
+        )
+
+
+@pytest.mark.parametrize("scope", ["global", "object", "context"])
+def test_extension_level_without_commands(
+    resource_path: Path, tmp_path: Path, scope: str
+):
+    used = tmp_path / "used.txt"
+    used.write_text("glClear\n")
+    output = tmp_path / "opengl.hxx"
+    args = ("--scope", scope, "--extensions", "GL_KHR_debug")
+    assert _generate(resource_path, output, *args, "--prune-unused", str(used)) == 0
+
+    # NOTE: the level has no previous one either, so load would be unused
+    assert "(void) load;" in output.read_text()
+
+
+def test_supported_extension_names(index: SpecIndex):
+    core = Feature(api=FeatureApi.GL, version=FeatureVersion(major=4, minor=6))
+    legacy = Feature(api=FeatureApi.GL, version=FeatureVersion(major=1, minor=1))
+
+    names = get_supported_extension_names(index, [core])
+    assert "GL_KHR_debug" in names and "GL_ARB_texture_float" not in names
+    assert "GL_ARB_texture_float" in get_supported_extension_names(index, [legacy])
+
+
+@pytest.mark.parametrize("size", [0, 1, 5, 64, 613])
+def test_extension_set_hashes_perfectly(index: SpecIndex, size: int):
+    names = list(index.extensions)[:size]
+    extension_set = prepare_extension_set(names)
+
+    bucket_mask = len(extension_set.seeds) - 1
+    slot_mask = len(extension_set.slots) - 1
+    for position, name in enumerate(names):
+        seed = extension_set.seeds[hash_name(name, 0) & bucket_mask]
+        assert extension_set.slots[hash_name(name, seed) & slot_mask] == position
+    assert extension_set.slots.count(size) == len(extension_set.slots) - size
+
+
+def test_generate_extension_queries(resource_path: Path, tmp_path: Path):
+    output = tmp_path / "opengl.hxx"
+    assert _generate(resource_path, output, "--extension-queries") == 0
+
+    code = output.read_text()
+    assert "enum extension : std::uint32_t {" in code
+    assert "\nKHR_debug,\n" in code and "\nARB_texture_float,\n" not in code
+    assert '"GL_KHR_debug",' in code
+    assert (
+        "inline bool has_extension(const ext::extension extension) noexcept {" in code
+    )
+    assert "inline bool load_extensions(" in code
+    # NOTE: tables are function-local statics, inline variables require C++17
+    assert "inline constexpr" not in code
+    assert "static constexpr std::uint32_t seeds[" in code
@@ -7,10 +7,13 @@ import pytest
 from gladiator.parse.feature import (
     is_compatible,
     get_feature_requirements,
+    get_feature_timeline,
     Feature,
     FeatureApi,
     FeatureVersion,
+    _parse_feature,
 )
+from gladiator.parse.spec import build_spec_index
 
 
 @pytest.mark.parametrize(
@@ -67,3 +70,38 @@ def test_parse_requirements(spec: xml.Element):
     requirements = get_feature_requirements(gl_3_3, candidates)
     assert "GL_CURRENT_BIT" not in requirements.enums
     assert "glFrustum" not in requirements.commands
+
+
+def _all_features(spec: xml.Element):
+    for feature in (_parse_feature(node) for node in _collect_features(spec)):
+        yield feature
+        # NOTE: versions in between features resolve to the previous feature
+        yield Feature(
+            api=feature.api,
+            version=FeatureVersion(
+                major=feature.version.major, minor=feature.version.minor + 5
+            ),
+        )
+
+
+def test_timeline_matches_replay(spec: xml.Element):
+    candidates = tuple(_collect_features(spec))
+    index = build_spec_index(spec)
+
+    for feature in _all_features(spec):
+        replayed = get_feature_requirements(feature, candidates)
+        resolved = get_feature_timeline(index, feature.api).resolve(feature.version)
+
+        assert resolved == replayed, str(feature)
+        assert tuple(resolved.enums.items()) == tuple(replayed.enums.items())
+        assert tuple(resolved.commands.items()) == tuple(replayed.commands.items())
+
+
+def test_timeline_availability(spec: xml.Element):
+    timeline = get_feature_timeline(build_spec_index(spec), FeatureApi.GL)
+    frustum = next(s for s in timeline.spans if s.name == "glFrustum")
+
+    assert frustum.introduced == FeatureVersion(major=1, minor=0)
+    assert frustum.removed == FeatureVersion(major=3, minor=2)
+    assert frustum.is_available(FeatureVersion(major=3, minor=1))
+    assert not frustum.is_available(FeatureVersion(major=3, minor=2))
@@ -0,0 +1,60 @@
+"""Test looking up definitions through the spec index."""
+
+import xml.etree.ElementTree as xml
+
+import pytest
+
+from gladiator.parse.command import parse_required_commands
+from gladiator.parse.enum import parse_required_enums
+from gladiator.parse.feature import (
+    get_feature_requirements,
+    Feature,
+    FeatureApi,
+    FeatureVersion,
+)
+from gladiator.parse.index import SpecIndex
+from gladiator.parse.spec import build_spec_index
+from gladiator.parse.type import get_type_definitions
+
+
+@pytest.fixture(scope="module")
+def index(spec: xml.Element) -> SpecIndex:
+    return build_spec_index(spec)
+
+
+def _children(spec: xml.Element, tag: str):
+    return tuple(node for node in spec if node.tag == tag)
+
+
+TESTED_FEATURES = (
+    Feature(api=FeatureApi.GL, version=FeatureVersion(major=1, minor=1)),
+    Feature(api=FeatureApi.GL, version=FeatureVersion(major=4, minor=6)),
+    Feature(api=FeatureApi.GLES2, version=FeatureVersion(major=3, minor=2)),
+)
+
+
+def test_index_types(spec: xml.Element, index: SpecIndex):
+    types_node = _children(spec, "types")[0]
+    assert tuple(get_type_definitions(index)) == tuple(get_type_definitions(types_node))
+
+
+def test_index_lookups(index: SpecIndex):
+    assert index.bitmask_groups["ClearBufferMask"]
+    assert not index.bitmask_groups.get("TextureTarget", False)
+    assert index.enums["GL_DEPTH_BUFFER_BIT"][0].value == "0x00000100"
+    assert "ClearBufferMask" in index.enums["GL_DEPTH_BUFFER_BIT"][0].groups
+    assert index.commands["glClear"].definition.find("proto/name").text == "glClear"
+    assert TESTED_FEATURES[0] in index.features
+
+
+@pytest.mark.parametrize("feature", TESTED_FEATURES)
+def test_index_matches_nodes(spec: xml.Element, index: SpecIndex, feature: Feature):
+    requirements = get_feature_requirements(feature, _children(spec, "feature"))
+    assert get_feature_requirements(feature, index) == requirements
+
+    enums = tuple(parse_required_enums(requirements.enums, _children(spec, "enums")))
+    assert tuple(parse_required_enums(requirements.enums, index)) == enums
+
+    commands_node = _children(spec, "commands")[0]
+    commands = tuple(parse_required_commands(requirements.commands, commands_node))
+    assert tuple(parse_required_commands(requirements.commands, index)) == commands
@@ -0,0 +1,34 @@
+"""Test profiling the phases of a generation run."""
+
+import json
+from pathlib import Path
+import pstats
+
+from gladiator.__main__ import cli
+from gladiator.profiling import Profiler
+
+
+def test_nested_phases_are_exclusive():
+    profiler = Profiler()
+    with profiler.phase("outer"):
+        for _ in range(2):
+            with profiler.phase("inner"):
+                pass
+
+    outer, inner = profiler.phases["outer"], profiler.phases["inner"]
+    assert (outer.calls, inner.calls) == (1, 2)
+    assert outer.seconds >= 0 and inner.seconds >= 0
+
+
+def test_profile_report(resource_path: Path, tmp_path: Path, capsys):
+    report, stats = tmp_path / "profile.json", tmp_path / "profile.prof"
+    args = ("--spec-file", str(resource_path / "gl.xml"), "--api", "gl")
+    args += ("--version", "1.1", "--no-cache", "--output", str(tmp_path / "gl.hxx"))
+    args += ("--profile", "--profile-json", str(report), "--profile-stats", str(stats))
+    assert cli(*args) == 0
+
+    phases = {p["name"]: p for p in json.loads(report.read_text())["phases"]}
+    assert {"load spec", "parse commands", "render and write"} <= phases.keys()
+    assert all(p["calls"] > 0 and p["peak_memory"] > 0 for p in phases.values())
+    assert "render and write" in capsys.readouterr().err
+    assert pstats.Stats(str(stats)).total_calls > 0
@@ -0,0 +1,106 @@
+"""Test serving generation requests."""
+
+import os
+from pathlib import Path
+import subprocess
+import sys
+import threading
+
+import pytest
+
+from gladiator.client import cli as client_cli
+from gladiator.server import serve
+
+
+@pytest.fixture
+def socket_path(tmp_path: Path):
+    path = tmp_path / "gladiator.sock"
+    ready = threading.Event()
+    server = threading.Thread(target=serve, args=(path, ready))
+    server.start()
+    ready.wait()
+    yield path
+    assert client_cli("--socket", str(path), "--shutdown") == 0
+    server.join()
+    assert not path.exists()
+
+
+def _generate(generate_cli, resource_path: Path, output: Path, *args: str):
+    spec_file = str(resource_path / "gl.xml")
+    base_args = ("--spec-file", spec_file, "--api", "gl", "--version", "3.3")
+    return generate_cli(*base_args, "--no-cache", "--output", str(output), *args)
+
+
+def _run_separately(*args: str):
+    # NOTE: in a process of its own, so state of earlier runs cannot leak in
+    command = [sys.executable, "-m", "gladiator", *args]
+    return subprocess.run(command, check=False).returncode
+
+
+def test_served_matches_local(socket_path: Path, resource_path: Path, tmp_path: Path):
+    def client(*args):
+        return client_cli("--socket", str(socket_path), *args)
+
+    # NOTE: alternated with default requests, so options of earlier requests
+    # leaking into later ones are noticed
+    requests = (
+        ("--scope", "object"),
+        ("--enum-namespace", "foo"),
+        ("--loader-table",),
+        ("--instrument",),
+        ("--lazy-load",),
+        ("--enum-case", "snake_case", "--generate-resource-wrappers"),
+        ("--generate-resource-wrappers",),
+    )
+    for args in ((), *(a for request in requests for a in (request, ()))):
+        assert _generate(client, resource_path, tmp_path / "served.hxx", *args) == 0
+        local = _generate(_run_separately, resource_path, tmp_path / "local.hxx", *args)
+        assert local == 0
+        assert (tmp_path / "served.hxx").read_text() == (
+            tmp_path / "local.hxx"
+        ).read_text()
+
+
+def test_served_overrides_are_reloaded(
+    socket_path: Path, resource_path: Path, tmp_path: Path
+):
+    def client(*args):
+        return client_cli("--socket", str(socket_path), *args)
+
+    overrides = tmp_path / "overrides"
+    overrides.mkdir()
+    output = tmp_path / "opengl.hxx"
+    args = ("--template-overrides-dir", str(overrides))
+
+    assert _generate(client, resource_path, output, *args) == 0
+    assert not output.read_text().startswith("// first")
+
+    (overrides / "before.jinja2").write_text("// first\n")
+    assert _generate(client, resource_path, output, *args) == 0
+    assert output.read_text().startswith("// first\n")
+
+
+def test_served_errors(socket_path: Path, resource_path: Path, tmp_path: Path):
+    args = ("--socket", str(socket_path), "--api", "gl", "--version", "1.1", "2.0")
+    assert _generate(client_cli, resource_path, tmp_path / "opengl.hxx", *args) == 1
+
+
+def test_client_without_server(resource_path: Path, tmp_path: Path):
+    output = tmp_path / "opengl.hxx"
+    socket_arg = ("--socket", str(tmp_path / "missing.sock"))
+    assert _generate(client_cli, resource_path, output, *socket_arg) == 0
+    assert output.exists()
+
+
+def test_socket_is_private(socket_path: Path):
+    assert socket_path.stat().st_mode & 0o777 == 0o600
+
+
+def test_client_refuses_foreign_socket(
+    socket_path: Path, resource_path: Path, tmp_path: Path, monkeypatch
+):
+    monkeypatch.setattr(os, "getuid", lambda: socket_path.stat().st_uid + 1)
+    output = tmp_path / "opengl.hxx"
+    with pytest.raises(SystemExit, match="not owned by the current user"):
+        _generate(client_cli, resource_path, output, "--socket", str(socket_path))
+    assert not output.exists()
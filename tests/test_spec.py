@@ -0,0 +1,28 @@
+"""Test loading the spec file."""
+
+from pathlib import Path
+import xml.etree.ElementTree as xml
+
+import pytest
+
+from gladiator.parse.spec import load_spec, REQUIRED_SECTIONS
+
+
+def _count(root: xml.Element, tag: str):
+    return sum(len(node) for node in root if node.tag == tag)
+
+
+@pytest.mark.parametrize("memory_map", [False, True])
+def test_load_required_sections(
+    spec: xml.Element, resource_path: Path, memory_map: bool
+):
+    root = load_spec(resource_path / "gl.xml", memory_map=memory_map)
+
+    assert {node.tag for node in root} == REQUIRED_SECTIONS
+    for tag in REQUIRED_SECTIONS:
+        assert _count(root, tag) == _count(spec, tag)
+
+
+def test_load_selected_sections(resource_path: Path):
+    root = load_spec(resource_path / "gl.xml", sections=("feature",))
+    assert {node.tag for node in root} == {"feature"}
@@ -0,0 +1,39 @@
+"""Test that starting the CLI and tools stays fast."""
+
+import re
+import subprocess
+import sys
+
+import pytest
+
+# NOTE: generous, loading the CLI takes well below this on a developer machine
+_IMPORT_BUDGET = 0.2
+_LAZY_MODULES = ("jinja2", "yaml", "configargparse", "multiprocessing", "tempfile")
+_IMPORT_TIME_PATTERN = re.compile(r"import time:\s*\d+ \|\s*(\d+) \| (\S+)")
+
+
+def _import(module: str, *flags: str):
+    return subprocess.run(
+        [sys.executable, *flags, "-c", f"import sys, {module}; print(*sys.modules)"],
+        check=True,
+        capture_output=True,
+        text=True,
+    )
+
+
+@pytest.mark.parametrize("module", ["gladiator.__main__", "gladiator.tools.compare"])
+def test_heavy_modules_are_imported_lazily(module: str):
+    loaded = set(_import(module).stdout.split())
+    assert not loaded.intersection(_LAZY_MODULES)
+
+
+def _measure_import(module: str):
+    for line in _import(module, "-X", "importtime").stderr.splitlines():
+        match = _IMPORT_TIME_PATTERN.match(line)
+        if match and match.group(2) == module:
+            return int(match.group(1)) / 1e6
+    raise AssertionError(f"{module} was not imported")
+
+
+def test_import_time_budget():
+    assert min(_measure_import("gladiator.__main__") for _ in range(3)) < _IMPORT_BUDGET
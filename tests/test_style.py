@@ -3,7 +3,7 @@
 import pytest
 
 from gladiator.options import Case
-from gladiator.prepare.style import transform_symbol
+from gladiator.prepare.style import transform_symbol, transform_symbols
 
 
 _TEST_CASES = (
@@ -117,3 +117,17 @@ def test_camel_case(input_: str, output: str):
 def test_pascal_case(input_: str, output: str):
     """Assert that the OpenGL command or enum is converted to pascal case."""
     assert transform_symbol(input_, Case.PASCAL_CASE, True) == output
+
+
+def test_keyword_conflicts():
+    """Assert that symbols colliding with C++ keywords get a trailing underscore."""
+    assert transform_symbol("GL_FALSE", Case.SNAKE_CASE, True) == "false_"
+    assert transform_symbol("GL_FALSE", Case.UPPER_CASE, True) == "FALSE"
+
+
+def test_transform_symbols():
+    """Assert that batches are transformed like single symbols, in order."""
+    symbols = _TEST_CASES + _TEST_CASES[::-1]
+    assert transform_symbols(symbols, Case.CAMEL_CASE, True) == [
+        transform_symbol(s, Case.CAMEL_CASE, True) for s in symbols
+    ]
@@ -0,0 +1,75 @@
+"""Test caching compiled templates."""
+
+from pathlib import Path
+
+import pytest
+
+from gladiator.generate.templates import (
+    make_loader_environment,
+    TemplateBytecodeCache,
+)
+from gladiator.tools import precompile
+from gladiator.tools.precompile import cli as precompile_cli
+
+
+def _make_environment(overrides: Path, cache_dir: Path):
+    env = make_loader_environment(overrides)
+    env.bytecode_cache = TemplateBytecodeCache(cache_dir, prebuilt_dir=None)
+    return env
+
+
+def test_compiled_templates_are_cached(tmp_path: Path):
+    overrides = tmp_path / "overrides"
+    overrides.mkdir()
+    cache_dir = tmp_path / "cache"
+    template = overrides / "custom.jinja2"
+
+    template.write_text("{{ 1 + 1 }}")
+    assert _make_environment(overrides, cache_dir).get_template("custom.jinja2")
+    assert len(list(cache_dir.iterdir())) == 1
+
+    env = _make_environment(overrides, cache_dir)
+    env.compile = None  # NOTE: fails if the template is compiled again
+    assert env.get_template("custom.jinja2").render() == "2"
+
+    template.write_text("{{ 2 + 2 }}")
+    env = _make_environment(overrides, cache_dir)
+    assert env.get_template("custom.jinja2").render() == "4"
+    assert len(list(cache_dir.iterdir())) == 2
+
+
+def test_prebuilt_bytecode_is_preferred(tmp_path: Path):
+    prebuilt_dir = tmp_path / "prebuilt"
+    cache_dir = tmp_path / "cache"
+
+    env = make_loader_environment(None)
+    env.bytecode_cache = TemplateBytecodeCache(prebuilt_dir, prebuilt_dir=None)
+    env.get_template("types.jinja2")
+
+    env = make_loader_environment(None)
+    env.bytecode_cache = TemplateBytecodeCache(cache_dir, prebuilt_dir=prebuilt_dir)
+    env.get_template("types.jinja2")
+    assert not cache_dir.exists()
+
+
+def test_precompile_removes_only_outdated_bytecode(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+):
+    output_dir = tmp_path / "bytecode"
+    assert precompile_cli("--output-dir", str(output_dir)) == 0
+    compiled = set(output_dir.iterdir())
+    assert compiled
+
+    # NOTE: rerunning is only allowed for the dir shipped with the package
+    monkeypatch.setattr(precompile, "PREBUILT_BYTECODE_DIR", output_dir)
+    (output_dir / "outdated.bytecode").write_bytes(b"")
+    (output_dir / "README").write_text("kept\n")
+    assert precompile_cli("--output-dir", str(output_dir)) == 0
+    assert set(output_dir.iterdir()) == compiled | {output_dir / "README"}
+
+
+def test_precompile_rejects_other_dirs(tmp_path: Path):
+    (tmp_path / "spec.index").write_bytes(b"")
+    with pytest.raises(SystemExit):
+        precompile_cli("--output-dir", str(tmp_path))
+    assert (tmp_path / "spec.index").exists()
@@ -0,0 +1,88 @@
+"""Test pruning commands by their usage."""
+
+import json
+from pathlib import Path
+import xml.etree.ElementTree as xml
+
+import pytest
+
+from gladiator.__main__ import cli
+from gladiator.options import Case, Options
+from gladiator.parse.command import parse_required_commands
+from gladiator.parse.index import SpecIndex
+from gladiator.parse.spec import build_spec_index
+from gladiator.usage import get_used_commands, scan_used_symbols
+
+
+@pytest.fixture(scope="module")
+def index(spec: xml.Element) -> SpecIndex:
+    return build_spec_index(spec)
+
+
+def test_scan_used_symbols(tmp_path: Path):
+    source = tmp_path / "app.cxx"
+    source.write_text("void draw() { gl::draw_arrays(mode, 0, 3); }\n")
+    symbols = tmp_path / "symbols.txt"
+    symbols.write_text("glClear\n")
+
+    used = scan_used_symbols([source, symbols])
+    assert {"draw_arrays", "gl", "mode", "glClear"} <= used
+    assert "0" not in used and "3" not in used
+
+
+def test_reject_missing_usage_file(tmp_path: Path):
+    with pytest.raises(SystemExit):
+        scan_used_symbols([tmp_path / "missing.cxx"])
+
+
+def test_used_commands_match_styled_names(index: SpecIndex):
+    names = ["glClear", "glDrawArrays", "glGenTextures", "glDeleteTextures"]
+    commands = tuple(parse_required_commands(names, index))
+    options = Options(function_case=Case.SNAKE_CASE, omit_prefix=True)
+
+    used = get_used_commands(commands, {"clear", "glDrawArrays", "texture"}, options)
+    assert [c.name for c in used] == ["glClear", "glDrawArrays"]
+
+
+def test_used_commands_keep_resource_wrappers(index: SpecIndex):
+    names = ["glClear", "glGenTextures", "glDeleteTextures", "glGenBuffers"]
+    commands = tuple(parse_required_commands(names, index))
+    options = Options(enum_case=Case.SNAKE_CASE, generate_resource_wrappers=True)
+
+    used = get_used_commands(commands, {"texture"}, options)
+    assert {c.name for c in used} == {"glGenTextures", "glDeleteTextures"}
+
+
+def _generate(resource_path: Path, output: Path, *args: str):
+    spec_file = str(resource_path / "gl.xml")
+    base_args = ("--spec-file", spec_file, "--api", "gl", "--version", "3.3")
+    return cli(*base_args, "--no-cache", "--output", str(output), *args)
+
+
+@pytest.mark.parametrize("scope", ["global", "object"])
+def test_generate_pruned(resource_path: Path, tmp_path: Path, scope: str):
+    source = tmp_path / "app.cxx"
+    source.write_text("glClear(ClearBufferMask::GL_COLOR_BUFFER_BIT);\n")
+    output = tmp_path / "opengl.hxx"
+    report = tmp_path / "report.json"
+    args = ("--scope", scope, "--prune-unused", str(source))
+    assert _generate(resource_path, output, *args, "--prune-report", str(report)) == 0
+
+    code = output.read_text()
+    assert 'load("glClear")' in code
+    assert 'load("glDrawArrays")' not in code
+    assert "PrimitiveType" not in code
+    # NOTE: levels without any used commands are still generated
+    assert "gl_33" in code
+
+    pruned = json.loads(report.read_text())
+    assert pruned["commands"]["kept"] == ["glClear"]
+    assert "glDrawArrays" in pruned["commands"]["pruned"]
+    assert pruned["enums"]["kept"] == ["ClearBufferMask"]
+    assert "PrimitiveType" in pruned["enums"]["pruned"]
+
+
+def test_reject_prune_report_without_usage(resource_path: Path, tmp_path: Path):
+    report = str(tmp_path / "report.json")
+    with pytest.raises(SystemExit):
+        _generate(resource_path, tmp_path / "opengl.hxx", "--prune-report", report)